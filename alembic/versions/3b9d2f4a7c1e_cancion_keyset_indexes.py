@@ -0,0 +1,31 @@
+"""cancion keyset indexes
+
+Revision ID: 3b9d2f4a7c1e
+Revises: 07ed021c069e
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f4a7c1e'
+down_revision: Union[str, None] = '07ed021c069e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # índices compuestos (clave de orden, id) para la paginación por cursor de
+    # /canciones: top -> numLikes, tendencia -> numVisualizaciones (este último
+    # se quita en e5b2c9d4f617, cuando tendencia pasa a cancion_tendencia.score)
+    op.create_index("ix_cancion_likes_id", "cancion", ["numLikes", "id"], if_not_exists=True)
+    op.create_index("ix_cancion_views_id", "cancion", ["numVisualizaciones", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cancion_views_id", table_name="cancion", if_exists=True)
+    op.drop_index("ix_cancion_likes_id", table_name="cancion", if_exists=True)
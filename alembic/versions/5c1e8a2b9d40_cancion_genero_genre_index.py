@@ -0,0 +1,32 @@
+"""cancion_genero genre index
+
+Revision ID: 5c1e8a2b9d40
+Revises: 3b9d2f4a7c1e
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8a2b9d40'
+down_revision: Union[str, None] = '3b9d2f4a7c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # filtro /canciones?genero=: EXISTS (... WHERE genre_id IN (...) AND cancion_id = cancion.id)
+    op.create_index(
+        "ix_cancion_genero_genre_cancion",
+        "cancion_genero",
+        ["genre_id", "cancion_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cancion_genero_genre_cancion", table_name="cancion_genero", if_exists=True)
@@ -0,0 +1,39 @@
+"""cancion_ranking
+
+Revision ID: 8e4f6a1d2b73
+Revises: 5c1e8a2b9d40
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f6a1d2b73'
+down_revision: Union[str, None] = '5c1e8a2b9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # rankings top/tendencia precalculados (genre_id = 0 -> global);
+    # los rellena el job periódico de app.services.rankings
+    op.create_table(
+        "cancion_ranking",
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("genre_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("cancion_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["cancion_id"], ["cancion.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("kind", "genre_id", "rank"),
+    )
+    op.create_index("ix_cancion_ranking_cancion_id", "cancion_ranking", ["cancion_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cancion_ranking_cancion_id", table_name="cancion_ranking")
+    op.drop_table("cancion_ranking")
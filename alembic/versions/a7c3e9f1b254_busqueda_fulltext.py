@@ -0,0 +1,55 @@
+"""busqueda fulltext
+
+Revision ID: a7c3e9f1b254
+Revises: 8e4f6a1d2b73
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1b254'
+down_revision: Union[str, None] = '8e4f6a1d2b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # configuración de texto "es_unaccent": stemming español ignorando tildes
+    # (SEARCH_TS_CONFIG en la app)
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+            ALTER TEXT SEARCH CONFIGURATION es_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+        END IF;
+    END$$;
+    """)
+
+    op.create_table(
+        "busqueda",
+        sa.Column("tipo", sa.String(length=16), nullable=False),
+        sa.Column("ref_id", sa.Integer(), nullable=False),
+        sa.Column("titulo", sa.String(length=255), nullable=False),
+        sa.Column("texto", sa.Text(), nullable=False),
+        sa.Column("documento", postgresql.TSVECTOR(), nullable=True),
+        sa.PrimaryKeyConstraint("tipo", "ref_id"),
+    )
+    op.create_index(
+        "ix_busqueda_documento", "busqueda", ["documento"], postgresql_using="gin"
+    )
+    # el índice se rellena con: python -m scripts.rebuild_search_index
+
+
+def downgrade() -> None:
+    op.drop_index("ix_busqueda_documento", table_name="busqueda")
+    op.drop_table("busqueda")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS es_unaccent")
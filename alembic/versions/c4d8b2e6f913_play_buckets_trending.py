@@ -0,0 +1,47 @@
+"""reproducciones por hora y puntuaciones de tendencia
+
+Revision ID: c4d8b2e6f913
+Revises: a7c3e9f1b254
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8b2e6f913'
+down_revision: Union[str, None] = 'a7c3e9f1b254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # reproducciones por canción y hora (las escribe el volcado de /play)
+    op.create_table(
+        "cancion_reproduccion_hora",
+        sa.Column("cancion_id", sa.Integer(), nullable=False),
+        sa.Column("hora", sa.DateTime(), nullable=False),
+        sa.Column("reproducciones", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["cancion_id"], ["cancion.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("cancion_id", "hora"),
+    )
+    op.create_index(
+        "ix_cancion_reproduccion_hora_hora", "cancion_reproduccion_hora", ["hora"]
+    )
+    # puntuación de tendencia con decaimiento (la rellena app.services.trending)
+    op.create_table(
+        "cancion_tendencia",
+        sa.Column("cancion_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["cancion_id"], ["cancion.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("cancion_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cancion_tendencia")
+    op.drop_index("ix_cancion_reproduccion_hora_hora", table_name="cancion_reproduccion_hora")
+    op.drop_table("cancion_reproduccion_hora")
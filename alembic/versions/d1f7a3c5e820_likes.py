@@ -0,0 +1,52 @@
+"""likes de canciones y álbumes
+
+Revision ID: d1f7a3c5e820
+Revises: c4d8b2e6f913
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f7a3c5e820'
+down_revision: Union[str, None] = 'c4d8b2e6f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # un like por (canción|álbum, usuario); numLikes se agrega por lotes
+    op.create_table(
+        "cancion_like",
+        sa.Column("cancion_id", sa.Integer(), nullable=False),
+        sa.Column("user_ref", sa.String(length=120), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["cancion_id"], ["cancion.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("cancion_id", "user_ref"),
+    )
+    op.create_index("ix_cancion_like_user_ref", "cancion_like", ["user_ref"])
+    op.create_table(
+        "album_like",
+        sa.Column("album_id", sa.Integer(), nullable=False),
+        sa.Column("user_ref", sa.String(length=120), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["album_id"], ["album.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("album_id", "user_ref"),
+    )
+    op.create_index("ix_album_like_user_ref", "album_like", ["user_ref"])
+    op.add_column(
+        "album",
+        sa.Column("numLikes", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("album", "numLikes")
+    op.drop_index("ix_album_like_user_ref", table_name="album_like")
+    op.drop_table("album_like")
+    op.drop_index("ix_cancion_like_user_ref", table_name="cancion_like")
+    op.drop_table("cancion_like")
@@ -0,0 +1,29 @@
+"""drop ix_cancion_views_id
+
+Revision ID: e5b2c9d4f617
+Revises: d1f7a3c5e820
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2c9d4f617'
+down_revision: Union[str, None] = 'd1f7a3c5e820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tendencia se ordena por cancion_tendencia.score: el índice sobre
+    # numVisualizaciones ya no lo usa ninguna consulta y solo encarece los
+    # UPDATE por lotes del contador de reproducciones
+    op.drop_index("ix_cancion_views_id", table_name="cancion", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_cancion_views_id", "cancion", ["numVisualizaciones", "id"], if_not_exists=True)
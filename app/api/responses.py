@@ -0,0 +1,49 @@
+# app/api/responses.py
+# Camino rápido de serialización para las respuestas grandes del catálogo.
+# Por defecto FastAPI valida el valor devuelto contra response_model, lo pasa
+# a dict con jsonable_encoder y luego lo codifica con json.dumps. Aquí se
+# valida con un TypeAdapter ya construido y pydantic-core escribe el JSON
+# directamente a bytes (Rust), sin el paso intermedio por dicts de Python.
+# Las rutas mantienen response_model para la documentación OpenAPI.
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+import orjson
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+from app.schemas.album import AlbumOut
+from app.schemas.song import CancionOut
+
+
+class FastJSONResponse(Response):
+    """JSON ya codificado (bytes) tal cual; cualquier otro contenido, con orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return orjson.dumps(content)
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+# los tipos de las rutas más pesadas se construyen al importar
+for _tp in (list[CancionOut], CancionOut, list[AlbumOut], AlbumOut):
+    adapter_for(_tp)
+
+
+def dump_json(tp: Any, data: Any) -> bytes:
+    """Valida `data` (objetos ORM) contra `tp` y devuelve el JSON como lo haría FastAPI."""
+    adapter = adapter_for(tp)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True), by_alias=True)
+
+
+def fast_response(tp: Any, data: Any, headers: Optional[Mapping[str, str]] = None) -> FastJSONResponse:
+    return FastJSONResponse(dump_json(tp, data), headers=headers)
@@ -8,6 +8,9 @@ from .album_upload import router as album_upload_router
 from .compras import router as compras_router
 from .playlists import router as playlists_router
 from .comentarios import router as comentarios_router
+from .diagnostics import router as diagnostics_router
+from .buscar import router as buscar_router
+from .likes import router as likes_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(canciones_router)
@@ -18,6 +21,9 @@ api_router.include_router(album_router)
 api_router.include_router(album_upload_router)
 api_router.include_router(playlists_router)
 api_router.include_router(comentarios_router)
+api_router.include_router(diagnostics_router)
+api_router.include_router(buscar_router)
+api_router.include_router(likes_router)
 
 
 
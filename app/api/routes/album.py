@@ -16,8 +16,11 @@ from sqlalchemy.orm import Session
 
 from app.schemas.album import AlbumOut, AlbumIn, AlbumUpdate, AlbumPriceUpdate
 from app.schemas.song import CancionOut
+from app.schemas.fields import InvalidFields, parse_fields, project, project_many
+from app.api.responses import FastJSONResponse, fast_response
 from app.dao.album_dao import AlbumDAO
-from app.factories import get_album_dao
+from app.dao.pagination import DEFAULT_LIMIT, MAX_LIMIT, NEXT_CURSOR_HEADER, InvalidCursor
+from app.factories import get_album_dao, get_album_read_dao
 from app.services.album_service import AlbumService
 from app.db import get_db
 from app.services.storage import save_upload  
@@ -25,20 +28,50 @@ from app.services.storage import save_upload
 router = APIRouter(tags=["albumes"])
 
 
+def _album_fields(
+    fields: str | None = Query(
+        None, description="Campos a devolver separados por comas (p. ej. id,titulo,imgPortada)"
+    ),
+):
+    try:
+        return parse_fields(fields, AlbumOut)
+    except InvalidFields as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
 @router.get("/albumes", response_model=list[AlbumOut])
 def listar_albumes(
     titulo: str | None = Query(None),
-    album_dao: AlbumDAO = Depends(get_album_dao),
+    cursor: str | None = Query(None, description="Cursor de la cabecera X-Next-Cursor de la página anterior"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: frozenset[str] | None = Depends(_album_fields),
+    album_dao: AlbumDAO = Depends(get_album_read_dao),
 ):
-    return album_dao.list_albums(titulo=titulo)
+    try:
+        albums, next_cursor = album_dao.list_albums_page(
+            titulo=titulo, cursor=cursor, limit=limit, fields=fields
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    # como en /canciones: el cuerpo es la lista y la página siguiente va en la cabecera
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if fields is not None:
+        return FastJSONResponse(project_many(albums, fields, AlbumOut), headers=headers)
+    return fast_response(list[AlbumOut], albums, headers)
 
 
 @router.get("/albumes/{album_id}", response_model=AlbumOut)
-def obtener_album(album_id: int, album_dao: AlbumDAO = Depends(get_album_dao)):
-    album = album_dao.get(album_id)
+def obtener_album(
+    album_id: int,
+    fields: frozenset[str] | None = Depends(_album_fields),
+    album_dao: AlbumDAO = Depends(get_album_read_dao),
+):
+    album = album_dao.get(album_id, fields=fields)
     if not album:
         raise HTTPException(status_code=404, detail="Album not found")
-    return album
+    if fields is not None:
+        return FastJSONResponse(project(album, fields, AlbumOut))
+    return fast_response(AlbumOut, album)
 
 
 
@@ -49,12 +82,13 @@ def obtener_album(album_id: int, album_dao: AlbumDAO = Depends(get_album_dao)):
 )
 def listar_canciones_de_album(
     album_id: int,
-    album_dao: AlbumDAO = Depends(get_album_dao),
+    album_dao: AlbumDAO = Depends(get_album_read_dao),
 ):
     """
     Devuelve todas las canciones asociadas a un álbum.
     """
-    album = album_dao.get(album_id)  # ya hace joinedload(Album.canciones)
+    # del álbum solo hace falta el id; las canciones llegan con géneros y artistas
+    album = album_dao.get(album_id, fields={"id"}, with_tracks=True)
     if not album:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,7 +96,7 @@ def listar_canciones_de_album(
         )
 
     # album.canciones es una lista de modelos Cancion
-    return album.canciones
+    return fast_response(list[CancionOut], album.canciones)
 
 
 @router.put(
@@ -70,7 +104,7 @@ def listar_canciones_de_album(
     response_model=AlbumOut,
     summary="Actualizar un álbum por ID (datos + portada opcional)",
 )
-async def update_album(
+def update_album(
     album_id: int,
     titulo: Optional[str] = Form(None),
     precio: Optional[float] = Form(None),
@@ -7,11 +7,12 @@ from typing import List, Optional
 from fastapi import (
     APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 )
+from fastapi.concurrency import run_in_threadpool
 
 from app.schemas.album import AlbumOut
-from app.factories import get_album_dao, get_song_dao
-from app.dao.album_dao import AlbumDAO
-from app.dao.song_dao import SongDAO
+from app.factories import get_async_album_dao, get_async_song_dao
+from app.dao.album_dao import AsyncAlbumDAO
+from app.dao.song_dao import AsyncSongDAO
 from app.services.storage import save_upload
 from app.services import auth_proxy as auth  # usa get_current_identity()
 
@@ -50,9 +51,9 @@ async def upload_album(
 
     # auth (tu proxy es ASYNC y devuelve {user_type, user_data:{email}})
     identity: dict = Depends(auth.get_current_identity),
-    # daos
-    album_dao: AlbumDAO = Depends(get_album_dao),
-    song_dao: SongDAO = Depends(get_song_dao),
+    # daos (async: la ruta es async def)
+    album_dao: AsyncAlbumDAO = Depends(get_async_album_dao),
+    song_dao: AsyncSongDAO = Depends(get_async_song_dao),
 ):
     # 1) Solo ARTISTAS
     if identity.get("user_type") != "artist":
@@ -63,7 +64,7 @@ async def upload_album(
 
     # 2) Parsear y validar existencia de canciones en una sola query
     ids = _parse_canciones_ids(canciones_ids)
-    songs = song_dao.get_many(ids)  # precarga relaciones
+    songs = await song_dao.get_many(ids)  # precarga relaciones
     found_ids = {s.id for s in songs}
     missing = [i for i in ids if i not in found_ids]
     if missing:
@@ -87,10 +88,10 @@ async def upload_album(
     # 4) Guardar portada (si viene)
     portada_path: Optional[str] = None
     if portada:
-        portada_path = save_upload(portada,"img")  
+        portada_path = await run_in_threadpool(save_upload, portada, "img")
 
     # 5) Crear álbum (tu DAO espera 'titulo' y 'artista_emails')
-    album = album_dao.create(
+    album = await album_dao.create(
         titulo=titulo,
         imgPortada=portada_path,
         precio=precio,
@@ -0,0 +1,33 @@
+# app/api/routes/buscar.py
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from app.dao.pagination import MAX_LIMIT, NEXT_CURSOR_HEADER, InvalidCursor
+from app.dao.search_dao import SearchDAO
+from app.factories.search import get_search_read_dao
+from app.schemas.search import BusquedaOut
+
+router = APIRouter(tags=["buscar"])
+
+
+@router.get(
+    "/buscar",
+    response_model=list[BusquedaOut],
+    summary="Buscar canciones y álbumes por título, género o artista",
+)
+def buscar(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    tipo: Optional[Literal["cancion", "album"]] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor de la cabecera X-Next-Cursor de la página anterior"),
+    limit: int = Query(20, ge=1, le=MAX_LIMIT),
+    search_dao: SearchDAO = Depends(get_search_read_dao),
+):
+    try:
+        hits, next_cursor = search_dao.search(q, tipo=tipo, cursor=cursor, limit=limit)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return hits
@@ -1,33 +1,76 @@
 # app/api/routes/canciones.py
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from app.schemas.song import CancionOut
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
+from app.schemas.song import CancionBatchIn, CancionBatchOut, CancionOut
 from app.schemas.album import AlbumOut
 
-from app.factories import get_song_dao, get_album_dao
+from app.factories import get_song_dao, get_song_read_dao, get_album_read_dao
 from app.dao.song_dao import SongDAO
 from app.dao.album_dao import AlbumDAO
+from app.dao.pagination import DEFAULT_LIMIT, MAX_LIMIT, NEXT_CURSOR_HEADER, InvalidCursor
+from app.schemas.fields import InvalidFields, parse_fields, project, project_many
+from app.api.responses import FastJSONResponse, fast_response
+from app.services.play_counter import record_play
 
 router = APIRouter(tags=["canciones"])
 
 SONG_NOT_FOUND = "Canción no encontrada"
+FIELDS_DESCRIPTION = "Campos a devolver separados por comas (p. ej. id,nomCancion,imgPortada)"
+
+
+def _song_fields(fields: str | None = Query(None, description=FIELDS_DESCRIPTION)):
+    try:
+        return parse_fields(fields, CancionOut)
+    except InvalidFields as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
 @router.get("/canciones", response_model=list[CancionOut])
 def listar_canciones(
     genero: str | None = Query(None),
     popularidad: str | None = Query(None),
-    song_dao: SongDAO = Depends(get_song_dao),
+    cursor: str | None = Query(None, description="Cursor de la cabecera X-Next-Cursor de la página anterior"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: frozenset[str] | None = Depends(_song_fields),
+    song_dao: SongDAO = Depends(get_song_read_dao),
 ):
-    return song_dao.list_songs(genero=genero, popularidad=popularidad)
+    try:
+        songs, next_cursor = song_dao.list_songs_page(
+            genero=genero, popularidad=popularidad, cursor=cursor, limit=limit, fields=fields
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    # el cuerpo sigue siendo una lista; la página siguiente va en la cabecera
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if fields is not None:
+        # proyección parcial: solo los campos pedidos
+        return FastJSONResponse(project_many(songs, fields, CancionOut), headers=headers)
+    return fast_response(list[CancionOut], songs, headers)
+
+
+# varias canciones en una petición (tracklists, playlists, biblioteca de compras)
+@router.post("/canciones/batch", response_model=CancionBatchOut)
+def obtener_canciones_batch(
+    payload: CancionBatchIn,
+    song_dao: SongDAO = Depends(get_song_read_dao),
+):
+    """Devuelve las canciones pedidas en el mismo orden e indica los ids que no existen."""
+    canciones, faltantes = song_dao.get_many_ordered(payload.ids)
+    return fast_response(CancionBatchOut, {"canciones": canciones, "faltantes": faltantes})
 
 
 # RF 4.3 - Obtener detalle de canción
 @router.get("/canciones/{song_id}", response_model=CancionOut, summary="Obtener detalle de canción (RF-4.3)")
-def get_song(song_id: int, song_dao: SongDAO = Depends(get_song_dao)):
-    song = song_dao.get(song_id)
+def get_song(
+    song_id: int,
+    fields: frozenset[str] | None = Depends(_song_fields),
+    song_dao: SongDAO = Depends(get_song_read_dao),
+):
+    song = song_dao.get(song_id, fields=fields)
     if not song:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=SONG_NOT_FOUND)
-    return song
+    if fields is not None:
+        return FastJSONResponse(project(song, fields, CancionOut))
+    return fast_response(CancionOut, song)
 
 @router.delete("/canciones/{song_id}", status_code=204)
 def borrar_cancion(song_id: int, song_dao: SongDAO = Depends(get_song_dao)):
@@ -40,29 +83,34 @@ def borrar_cancion(song_id: int, song_dao: SongDAO = Depends(get_song_dao)):
 @router.get("/artistas/{email_artista}/canciones", response_model=list[CancionOut])
 def listar_canciones_por_artista(
     email_artista: str,
-    song_dao: SongDAO = Depends(get_song_dao)
+    song_dao: SongDAO = Depends(get_song_read_dao)
 ):
     """Lista las canciones de un artista dado su email."""
-    return song_dao.get_by_artist(email_artista)
+    return fast_response(list[CancionOut], song_dao.get_by_artist(email_artista))
 
 @router.get("/artistas/{email_artista}/albumes", response_model=list[AlbumOut])
 def listar_albumes_por_artista(
-    email_artista: str, album_dao: AlbumDAO = Depends(get_album_dao)
+    email_artista: str, album_dao: AlbumDAO = Depends(get_album_read_dao)
 ):
     """Lista los álbumes de un artista dado su email."""
-    return album_dao.get_by_artist(email_artista)
+    return fast_response(list[AlbumOut], album_dao.get_by_artist(email_artista))
 
-# incrementa numVisualizaciones de una canción
-@router.post("/canciones/{song_id}/play", response_model=CancionOut)
+# registra una reproducción: se acumula en memoria y se vuelca a
+# numVisualizaciones por lotes (app/services/play_counter.py)
+@router.post(
+    "/canciones/{song_id}/play",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_class=Response,
+    responses={202: {"description": "Reproducción registrada"}},
+)
 def registrar_reproduccion(
     song_id: int,
-    song_dao: SongDAO = Depends(get_song_dao),
+    song_dao: SongDAO = Depends(get_song_read_dao),
 ):
-    song = song_dao.increment_views(song_id)
-    if song is None:
+    if not song_dao.exists(song_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=SONG_NOT_FOUND,
         )
-    return song
-
+    record_play(song_id)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
@@ -1,28 +1,24 @@
 # app/api/routes/canciones_upload.py
 from __future__ import annotations
 
-from sqlalchemy import func
-
-
 import inspect
 from datetime import date as Date
 from pathlib import Path
 from typing import List, Optional, Any
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.db import get_db
-from app.dao.song_dao import SongDAO
-from app.factories import get_song_dao
+from app.dao.song_dao import AsyncSongDAO
+from app.factories import get_async_song_dao
 from app.schemas.song import CancionOut, CancionUpdate, CancionPriceUpdate
 from app.services.song_service import SongService
 from app.services import storage
 from app import config
 from app.services.auth_proxy import get_current_identity
 
-from app.models.genre import Genre
-
 router = APIRouter(tags=["canciones"])
 
 
@@ -72,11 +68,10 @@ def _validate_upload(
 
 
 async def _save_maybe_async(func, *args, **kwargs) -> str:
-    """Compatibilidad: si storage.save_upload es async o sync."""
-    res = func(*args, **kwargs)
-    if inspect.isawaitable(res):
-        return await res
-    return res
+    """Compatibilidad: si storage.save_upload es async o sync (sync -> threadpool)."""
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
 
 
 @router.post(
@@ -97,8 +92,8 @@ async def upload_cancion(
     audio: UploadFile = File(...),
     portada: Optional[UploadFile] = File(None),
 
-    db: Session = Depends(get_db),
-    song_dao: SongDAO = Depends(get_song_dao),
+    # DAO async: la ruta es async def y no debe bloquear el event loop
+    song_dao: AsyncSongDAO = Depends(get_async_song_dao),
     # auth para obtener identidad del que sube
     identity: dict = Depends(get_current_identity),
 ):
@@ -123,11 +118,7 @@ async def upload_cancion(
     genre_names = [g.strip() for g in genre_names if g and g.strip()]
     unique_lower = {g.lower() for g in genre_names}
     if unique_lower:
-        existing = (
-            db.query(Genre)
-            .filter(func.lower(Genre.name).in_(list(unique_lower)))
-            .all()
-        )
+        existing = await song_dao.get_genres_by_names(unique_lower)
         map_lower = {g.name.lower(): g for g in existing}
         missing = sorted(unique_lower - set(map_lower.keys()))
         if missing:
@@ -136,10 +127,6 @@ async def upload_cancion(
         # normaliza (usa la capitalización exacta de BD)
         genre_names = [map_lower[g.lower()].name for g in genre_names]
 
-        # además, fija el "principal" (campo string) al primero
-        if genre_names:
-            genre = genre_names[0]
-
 
     # 1) Validaciones de archivos
     _validate_upload(audio, config.ALLOWED_AUDIO_EXTS, config.MAX_AUDIO_MB, "audio", "audio/")
@@ -153,17 +140,15 @@ async def upload_cancion(
         portada_path = await _save_maybe_async(storage.save_upload, portada, subdir="img")
 
     # 3) Persistencia (el DAO solo escribe en su BD)
-    song = song_dao.create(
-        nom_cancion=nom_cancion,
+    song = await song_dao.create(
+        nomCancion=nom_cancion,
         archivoMp3=audio_path,
         imgPortada=portada_path,
-        # genre=genre,
         precio=precio,
         date=date,
         artistas_emails=artistas_emails or [],
-        id_album=id_album,
-        genre_names=genre_names,            
-
+        idAlbum=id_album,
+        genre_names=genre_names,
     )
 
     return song
@@ -176,7 +161,7 @@ async def upload_cancion(
     response_model=CancionOut,
     summary="Actualizar una canción por ID (datos + portada opcional)",
 )
-async def update_cancion(
+def update_cancion(
     song_id: int,
     nom_cancion: Optional[str] = Form(None),
     generos: Optional[List[str]] = Form(None),
@@ -194,13 +179,13 @@ async def update_cancion(
     update_data: dict[str, Any] = {}
 
     if nom_cancion is not None:
-        update_data["nom_cancion"] = nom_cancion
+        update_data["nomCancion"] = nom_cancion
     if precio is not None:
         update_data["precio"] = precio
     if date is not None:
         update_data["date"] = date
     if id_album is not None:
-        update_data["id_album"] = id_album
+        update_data["idAlbum"] = id_album
     if artistas_emails is not None:
         update_data["artistas_emails"] = artistas_emails
     if generos is not None:
@@ -215,9 +200,7 @@ async def update_cancion(
             "portada",
             "image/",
         )
-        portada_path = await _save_maybe_async(
-            storage.save_upload, portada, subdir="img"
-        )
+        portada_path = storage.save_upload(portada, subdir="img")
         update_data["imgPortada"] = portada_path
 
     if not update_data:
@@ -240,7 +223,7 @@ async def update_cancion(
     response_model=CancionOut,
     summary="Actualizar el precio de una canción",
 )
-async def update_cancion_price(
+def update_cancion_price(
     song_id: int,
     price_update: CancionPriceUpdate,
     db: Session = Depends(get_db),
@@ -4,7 +4,7 @@ from typing import List
 
 from app.schemas.comment import CommentCreate, CommentOut
 from app.dao.comment_dao import CommentDAO
-from app.factories.comment import get_comment_dao
+from app.factories.comment import get_comment_dao, get_comment_read_dao
 from app.services import auth_proxy as auth
 
 router = APIRouter(tags=["comentarios"])
@@ -30,7 +30,7 @@ def _get_user_email(identity: dict) -> str:
 )
 def listar_comentarios_cancion(
     song_id: int,
-    comment_dao: CommentDAO = Depends(get_comment_dao)
+    comment_dao: CommentDAO = Depends(get_comment_read_dao)
 ):
     return comment_dao.get_by_song(song_id)
 
@@ -67,7 +67,7 @@ def comentar_cancion(
 )
 def listar_comentarios_album(
     album_id: int,
-    comment_dao: CommentDAO = Depends(get_comment_dao)
+    comment_dao: CommentDAO = Depends(get_comment_read_dao)
 ):
     return comment_dao.get_by_album(album_id)
 
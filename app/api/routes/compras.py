@@ -4,14 +4,18 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session, joinedload
 
 from app.services import auth_proxy as auth
-from app.db import get_db
-from app.factories.purchase import get_purchase_dao, get_album_purchase_dao
-from app.dao.purchase_dao import PurchaseDAO
-from app.dao.album_purchase_dao import AlbumPurchaseDAO
-from app.models.album import Album
+from app.factories.album import get_async_album_dao
+from app.factories.purchase import (
+    get_purchase_dao,
+    get_album_purchase_dao,
+    get_async_purchase_dao,
+    get_async_album_purchase_dao,
+)
+from app.dao.album_dao import AsyncAlbumDAO
+from app.dao.purchase_dao import PurchaseDAO, AsyncPurchaseDAO
+from app.dao.album_purchase_dao import AlbumPurchaseDAO, AsyncAlbumPurchaseDAO
 from app.schemas.purchase import (
     CompraCreate,
     CompraOut,
@@ -32,7 +36,7 @@ router = APIRouter(tags=["compras"])
 )
 async def crear_compra(
     payload: CompraCreate,
-    purchase_dao: PurchaseDAO = Depends(get_purchase_dao),
+    purchase_dao: AsyncPurchaseDAO = Depends(get_async_purchase_dao),
     identity: dict = Depends(auth.get_current_identity),
 ):
     # se saca el email del token, que viene de la API de usuarios
@@ -45,7 +49,7 @@ async def crear_compra(
         raise HTTPException(status_code=403, detail="No puedes comprar en nombre de otro usuario")
 
     try:
-        comp = purchase_dao.purchase(
+        comp = await purchase_dao.purchase(
             song_id=payload.song_id,
             user_ref=user_email,         # EMAIL VERIFICADO
             price_paid=payload.price_paid,
@@ -97,9 +101,9 @@ def comprobar_compra(
 async def comprar_album(
     album_id: int,
     payload: CompraAlbumCreate,
-    db: Session = Depends(get_db),
-    album_purchase_dao: AlbumPurchaseDAO = Depends(get_album_purchase_dao),
-    purchase_dao: PurchaseDAO = Depends(get_purchase_dao),
+    album_dao: AsyncAlbumDAO = Depends(get_async_album_dao),
+    album_purchase_dao: AsyncAlbumPurchaseDAO = Depends(get_async_album_purchase_dao),
+    purchase_dao: AsyncPurchaseDAO = Depends(get_async_purchase_dao),
     identity: dict = Depends(auth.get_current_identity),
 ):
     user_email = (identity.get("user_data") or {}).get("email")
@@ -108,7 +112,7 @@ async def comprar_album(
 
     # 1) Registrar compra de álbum (cabecera)
     try:
-        compra_album = album_purchase_dao.purchase_album(
+        compra_album = await album_purchase_dao.purchase_album(
             album_id=album_id,
             user_ref=user_email,
             price_paid=payload.price_paid,
@@ -121,9 +125,9 @@ async def comprar_album(
         raise
 
     # 2) Asegurar compras de todas las canciones (idempotente)
-    album = db.query(Album).options(joinedload(Album.canciones)).filter(Album.id == album_id).one()
-    for song in album.canciones:
-        purchase_dao.purchase(song_id=song.id, user_ref=user_email)
+    song_ids = await album_dao.get_song_ids(album_id) or []
+    for song_id in song_ids:
+        await purchase_dao.purchase(song_id=song_id, user_ref=user_email)
 
     return compra_album
 
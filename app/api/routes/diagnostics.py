@@ -0,0 +1,55 @@
+# app/api/routes/diagnostics.py
+from fastapi import APIRouter, Depends, HTTPException
+
+from app import db
+from app.config import settings
+from app.services import auth_proxy
+from app.services.identity_cache import identity_cache
+from app.services import response_cache
+from app.services.like_counter import like_counter, like_counter_flusher
+from app.services.play_counter import play_counter, play_counter_flusher
+from app.services.rankings import ranking_refresher
+from app.services.trending import trending_rollup
+from app.services.users_client import pool_stats
+
+
+def _diagnostics_enabled() -> None:
+    # desactivado (DIAGNOSTICS_ENABLED=false) se responde como si no existiera
+    if not settings.diagnostics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(
+    prefix="/diagnostics",
+    tags=["diagnostics"],
+    dependencies=[Depends(_diagnostics_enabled)],
+    include_in_schema=settings.diagnostics_enabled,
+)
+
+
+@router.get("/auth", summary="Estado del cliente HTTP de usuarios y de la caché de identidades")
+def diagnostico_auth():
+    return {
+        "users_client": pool_stats(),
+        "identity_cache": identity_cache.stats(),
+        "auth_me_inflight": len(auth_proxy._inflight),
+        "users_breaker": auth_proxy.users_breaker.stats(),
+    }
+
+
+@router.get("/db", summary="Estado del pool de conexiones a la base de datos")
+def diagnostico_db():
+    return {
+        "pool": db.pool_stats(),
+        "async_pool": db.async_pool_stats(),
+        "replicas": db.replica_pool_stats(),
+        "rankings": ranking_refresher.stats(),
+        "tendencias": trending_rollup.stats(),
+        "play_counter": {**play_counter.stats(), "flusher": play_counter_flusher.stats()},
+        "like_counter": {**like_counter.stats(), "flusher": like_counter_flusher.stats()},
+    }
+
+
+@router.get("/cache", summary="Estado de la caché de respuestas del catálogo")
+def diagnostico_cache():
+    return response_cache.backend.stats()
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.db import get_db
-from app.models.genre import Genre
+from app.db import get_read_db
+from app.services.genre_registry import genre_registry
 
 router = APIRouter(tags=["generos"])
 
 @router.get("/generos", response_model=list[str])
-def listar_generos(db: Session = Depends(get_db)):
-    rows = db.query(Genre.name).order_by(Genre.name.asc()).all()
-    return [name for (name,) in rows]
+def listar_generos(db: Session = Depends(get_read_db)):
+    # desde el registro en memoria: la sesión solo se usa si aún no está cargado
+    return genre_registry.names(db)
 
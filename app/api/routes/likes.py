@@ -0,0 +1,99 @@
+# app/api/routes/likes.py
+# "Me gusta" de canciones y álbumes. PUT/DELETE son idempotentes; numLikes se
+# actualiza por lotes poco después (app/services/like_counter.py).
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.dao.like_dao import LikeDAO
+from app.factories.like import get_like_dao, get_like_read_dao
+from app.schemas.like import LikeCheckMultipleIn, LikeCheckMultipleOut
+from app.services import auth_proxy as auth
+
+router = APIRouter(tags=["likes"])
+
+_NOT_FOUND = {"cancion": "Canción no encontrada", "album": "Álbum no encontrado"}
+
+
+def _get_user_email(identity: dict) -> str:
+    email = (identity.get("user_data") or {}).get("email")
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no identificado o token inválido",
+        )
+    return email
+
+
+def _like(kind: str, target_id: int, like_dao: LikeDAO, identity: dict) -> Response:
+    email = _get_user_email(identity)
+    try:
+        like_dao.like(kind, target_id, email)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_NOT_FOUND[kind])
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _unlike(kind: str, target_id: int, like_dao: LikeDAO, identity: dict) -> Response:
+    like_dao.unlike(kind, target_id, _get_user_email(identity))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.put("/canciones/{song_id}/like", status_code=204, summary="Dar me gusta a una canción")
+def dar_like_cancion(
+    song_id: int,
+    like_dao: LikeDAO = Depends(get_like_dao),
+    identity: dict = Depends(auth.get_current_identity),
+):
+    return _like("cancion", song_id, like_dao, identity)
+
+
+@router.delete("/canciones/{song_id}/like", status_code=204, summary="Quitar me gusta a una canción")
+def quitar_like_cancion(
+    song_id: int,
+    like_dao: LikeDAO = Depends(get_like_dao),
+    identity: dict = Depends(auth.get_current_identity),
+):
+    return _unlike("cancion", song_id, like_dao, identity)
+
+
+@router.put("/albumes/{album_id}/like", status_code=204, summary="Dar me gusta a un álbum")
+def dar_like_album(
+    album_id: int,
+    like_dao: LikeDAO = Depends(get_like_dao),
+    identity: dict = Depends(auth.get_current_identity),
+):
+    return _like("album", album_id, like_dao, identity)
+
+
+@router.delete("/albumes/{album_id}/like", status_code=204, summary="Quitar me gusta a un álbum")
+def quitar_like_album(
+    album_id: int,
+    like_dao: LikeDAO = Depends(get_like_dao),
+    identity: dict = Depends(auth.get_current_identity),
+):
+    return _unlike("album", album_id, like_dao, identity)
+
+
+@router.post(
+    "/canciones/likes/check",
+    response_model=LikeCheckMultipleOut,
+    summary="Comprobar qué canciones le gustan al usuario",
+)
+def comprobar_likes_canciones(
+    payload: LikeCheckMultipleIn,
+    like_dao: LikeDAO = Depends(get_like_read_dao),
+    identity: dict = Depends(auth.get_current_identity),
+):
+    return {"liked": like_dao.liked_ids("cancion", _get_user_email(identity), payload.ids)}
+
+
+@router.post(
+    "/albumes/likes/check",
+    response_model=LikeCheckMultipleOut,
+    summary="Comprobar qué álbumes le gustan al usuario",
+)
+def comprobar_likes_albumes(
+    payload: LikeCheckMultipleIn,
+    like_dao: LikeDAO = Depends(get_like_read_dao),
+    identity: dict = Depends(auth.get_current_identity),
+):
+    return {"liked": like_dao.liked_ids("album", _get_user_email(identity), payload.ids)}
@@ -8,10 +8,95 @@ load_dotenv()
 
 class Settings(BaseModel):
     database_url: str = os.getenv("DATABASE_URL")
+    # URL para el engine async; si no se indica se deriva de DATABASE_URL
+    # (postgresql+psycopg sirve para ambos, sqlite usa aiosqlite)
+    async_database_url: str | None = os.getenv("ASYNC_DATABASE_URL")
+    # réplicas de solo lectura (separadas por comas); vacío = todo va al primario
+    read_replica_urls: list[str] = [
+        u.strip() for u in os.getenv("READ_REPLICA_URLS", "").split(",") if u.strip()
+    ]
+    # tras escribir, las lecturas del mismo cliente van al primario durante N segundos
+    read_your_writes_window: float = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+    # pool de conexiones a BD (por proceso)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    db_pool_warmup: bool = os.getenv("DB_POOL_WARMUP", "false").lower() in ("1", "true", "yes")
     upload_dir: str = os.getenv("UPLOAD_DIR", "app/static/uploads")
     file_base_url: str = os.getenv("FILE_BASE_URL", "http://localhost:8080/files")
     users_base_url: str = os.getenv("USERS_BASE_URL", "http://127.0.0.1:8001")  # <— NUEVO
 
+    # cliente HTTP compartido hacia el microservicio de usuarios
+    users_max_connections: int = int(os.getenv("USERS_MAX_CONNECTIONS", "100"))
+    users_max_keepalive: int = int(os.getenv("USERS_MAX_KEEPALIVE", "20"))
+    users_keepalive_expiry: float = float(os.getenv("USERS_KEEPALIVE_EXPIRY", "30"))
+    users_http2: bool = os.getenv("USERS_HTTP2", "false").lower() in ("1", "true", "yes")
+    users_connect_timeout: float = float(os.getenv("USERS_CONNECT_TIMEOUT", "1.0"))
+    users_read_timeout: float = float(os.getenv("USERS_READ_TIMEOUT", "3.0"))
+    users_write_timeout: float = float(os.getenv("USERS_WRITE_TIMEOUT", "3.0"))
+    users_pool_timeout: float = float(os.getenv("USERS_POOL_TIMEOUT", "1.0"))
+
+    # instrumentación SQL por petición (Server-Timing + logs)
+    sql_metrics: bool = os.getenv("SQL_METRICS", "true").lower() in ("1", "true", "yes")
+    # desarrollo: avisa de sentencias idénticas repetidas (patrones N+1)
+    sql_n1_detection: bool = os.getenv("SQL_N1_DETECTION", "false").lower() in ("1", "true", "yes")
+    sql_n1_threshold: int = int(os.getenv("SQL_N1_THRESHOLD", "5"))
+    # tests: toda carga perezosa de relaciones lanza excepción (lazy="raise")
+    sql_raise_on_lazy_load: bool = os.getenv("SQL_RAISE_ON_LAZY_LOAD", "false").lower() in ("1", "true", "yes")
+    # /api/diagnostics/* (pools, réplicas, breaker, contadores...): sin
+    # autenticación, así que solo se exponen si se activan explícitamente
+    diagnostics_enabled: bool = os.getenv("DIAGNOSTICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+    # modo de autenticación: "remote" (/auth/me), "local" (JWT verificado aquí)
+    # o "hybrid" (local y, si no hay clave para el token, /auth/me)
+    auth_mode: str = os.getenv("AUTH_MODE", "remote").lower()
+    jwt_public_key_file: str | None = os.getenv("JWT_PUBLIC_KEY_FILE")
+    jwt_jwks_file: str | None = os.getenv("JWT_JWKS_FILE")
+    jwt_algorithms: list[str] = os.getenv("JWT_ALGORITHMS", "RS256").split(",")
+    jwt_audience: str | None = os.getenv("JWT_AUDIENCE")
+    jwt_issuer: str | None = os.getenv("JWT_ISSUER")
+    jwt_user_type_claim: str = os.getenv("JWT_USER_TYPE_CLAIM", "user_type")
+
+    # caché de identidades (token -> /auth/me)
+    identity_cache_ttl: float = float(os.getenv("IDENTITY_CACHE_TTL", "60"))
+    identity_cache_max_size: int = int(os.getenv("IDENTITY_CACHE_MAX_SIZE", "10000"))
+    # segundos extra que se puede servir una identidad ya validada si el
+    # servicio de usuarios está caído (0 = desactivado)
+    identity_stale_grace: float = float(os.getenv("IDENTITY_STALE_GRACE", "0"))
+
+    # cada cuántos segundos se recalculan los rankings top/tendencia (0 = nunca)
+    ranking_refresh_interval: float = float(os.getenv("RANKING_REFRESH_INTERVAL", "300"))
+
+    # reproducciones (/play) acumuladas en memoria y volcadas a BD cada N
+    # segundos en un UPDATE por lotes (0 = se vuelcan en la propia petición)
+    play_counter_flush_interval: float = float(os.getenv("PLAY_COUNTER_FLUSH_INTERVAL", "5"))
+    # cada cuántos segundos se recalcula numLikes de lo que ha recibido likes
+    # (0 = justo después del commit de cada like)
+    like_counter_flush_interval: float = float(os.getenv("LIKE_COUNTER_FLUSH_INTERVAL", "10"))
+
+    # tendencia: reproducciones por hora con decaimiento exponencial
+    # (vida media y ventana en horas; rollup cada N segundos, 0 = nunca)
+    trending_half_life_hours: float = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+    trending_window_hours: int = int(os.getenv("TRENDING_WINDOW_HOURS", "168"))
+    trending_rollup_interval: float = float(os.getenv("TRENDING_ROLLUP_INTERVAL", "300"))
+
+    # caché de respuestas de los GET del catálogo (TTL en segundos)
+    response_cache_enabled: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    # "memory" (por proceso) o "paquete.modulo:Clase" con un CacheBackend compartido
+    response_cache_backend: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    response_cache_max_entries: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+    response_cache_ttl_list: float = float(os.getenv("RESPONSE_CACHE_TTL_LIST", "30"))
+    response_cache_ttl_detail: float = float(os.getenv("RESPONSE_CACHE_TTL_DETAIL", "60"))
+    response_cache_ttl_genres: float = float(os.getenv("RESPONSE_CACHE_TTL_GENRES", "600"))
+
+    # configuración de texto de la búsqueda (la crea la migración: spanish + unaccent)
+    search_ts_config: str = os.getenv("SEARCH_TS_CONFIG", "es_unaccent")
+
+    # circuit breaker hacia el servicio de usuarios
+    users_breaker_failure_threshold: int = int(os.getenv("USERS_BREAKER_FAILURE_THRESHOLD", "5"))
+    users_breaker_reset_timeout: float = float(os.getenv("USERS_BREAKER_RESET_TIMEOUT", "30"))
 
 
 settings = Settings()
@@ -1,13 +1,24 @@
-from typing import Optional, Dict, Any, List, Set
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models.album import Album
 from app.models.song import Cancion
-from app.models.genre import Genre
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 from app.models.artist_links import AlbumArtistaLink
+from app.dao.loaders import attach_child_ids, ensure_loaded, field_options, loader_profile
+from app.dao.pagination import DEFAULT_LIMIT, decode_cursor, encode_cursor
+from app.services.genre_registry import genre_registry
+
+# campos de AlbumOut que dependen de una relación (para ?fields=); canciones_ids
+# no carga la relación: los ids llegan en una consulta aparte (_attach_song_ids)
+_FIELD_LOADERS = {
+    "genre": selectinload(Album.genres),
+    "artistas_emails": selectinload(Album.artistas_refs),
+}
+_CURSOR_MODE = "albumes"
+
 
 class AlbumDAO:
     def __init__(self, db: Session):
@@ -29,21 +40,84 @@ class AlbumDAO:
         return path.lstrip("/")
 
 
-    def list_albums(self, *, titulo: Optional[str] = None):
-        # Cargar las relaciones de géneros y canciones
-        q = self.db.query(Album).options(
-            joinedload(Album.genres),
-            joinedload(Album.canciones)
-        )
+    def _load_options(self, fields: Optional[Iterable[str]]) -> list:
+        """Precarga completa para AlbumOut, o solo lo que piden `fields`."""
+        if fields is not None:
+            return field_options(Album, fields, _FIELD_LOADERS)
+        return loader_profile("AlbumOut-complete")
+
+    def _attach_song_ids(self, albums: List[Album], fields: Optional[Iterable[str]]) -> List[Album]:
+        """canciones_ids de todos los álbumes en una consulta, sin instanciar las canciones."""
+        if albums and (fields is None or "canciones_ids" in fields):
+            attach_child_ids(self.db, albums, "_canciones_ids", Cancion.idAlbum, Cancion.id)
+        return albums
+
+    def list_albums(self, *, titulo: Optional[str] = None, fields: Optional[Iterable[str]] = None):
+        albums, _ = self.list_albums_page(titulo=titulo, fields=fields)
+        return albums
+
+    def list_albums_page(
+        self,
+        *,
+        titulo: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Album], Optional[str]]:
+        """
+        Página de álbumes por id y el cursor de la siguiente (None si es la
+        última). Lanza InvalidCursor si el cursor no es válido.
+        """
+        q = self.db.query(Album).options(*self._load_options(fields))
         if titulo:
             q = q.filter(Album.titulo.ilike(f"%{titulo}%"))
-        return q.limit(200).all()
+        if cursor:
+            _, last_id = decode_cursor(cursor, _CURSOR_MODE)
+            q = q.filter(Album.id > last_id)
+        # una fila de más para saber si hay página siguiente
+        albums = q.order_by(Album.id).limit(limit + 1).all()
+        if len(albums) <= limit:
+            return self._attach_song_ids(albums, fields), None
+        albums = self._attach_song_ids(albums[:limit], fields)
+        return albums, encode_cursor(_CURSOR_MODE, None, albums[-1].id)
+
+    def get(
+        self,
+        album_id: int,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        with_tracks: bool = False,
+    ) -> Optional[Album]:
+        """
+        Álbum para AlbumOut. Con `with_tracks` se cargan además sus canciones
+        listas para CancionOut (géneros y artistas incluidos).
+        """
+        options = self._load_options(fields)
+        if with_tracks:
+            options += loader_profile("CancionOut-complete", via=Album.canciones)
+        album = self.db.query(Album).options(*options).filter(Album.id == album_id).first()
+        if album is not None and not with_tracks:
+            self._attach_song_ids([album], fields)
+        return album
+
+    def get_with_songs(self, album_id: int) -> Optional[Album]:
+        """
+        Álbum para AlbumOut con sus canciones cargadas: lo necesita quien
+        reasigna album.canciones (hay que comparar con la colección actual).
+        """
+        return (
+            self.db.query(Album)
+            .options(*self._load_options(None), selectinload(Album.canciones))
+            .filter(Album.id == album_id)
+            .first()
+        )
 
-    def get(self, album_id: int) -> Optional[Album]:
-        return self.db.query(Album).options(
-            joinedload(Album.genres),
-            joinedload(Album.canciones)
-        ).filter(Album.id == album_id).first()
+    def get_song_ids(self, album_id: int) -> Optional[List[int]]:
+        """Ids de las canciones del álbum (None si el álbum no existe)."""
+        if self.db.query(Album.id).filter(Album.id == album_id).first() is None:
+            return None
+        rows = self.db.query(Cancion.id).filter(Cancion.idAlbum == album_id).all()
+        return [song_id for (song_id,) in rows]
 
     def create(
         self,
@@ -76,14 +150,10 @@ class AlbumDAO:
             norm = [g.strip().lower() for g in genre_names if g.strip()]
 
             if norm:
-                genres = (
-                    self.db.query(Genre)
-                    .filter(func.lower(Genre.name).in_(norm))
-                    .all()
-                )
-
-                if len(genres) != len(norm):
-                    missing = set(norm) - {g.name.lower() for g in genres}
+                genres = genre_registry.get_genres(self.db, norm)
+
+                missing = set(norm) - {g.name.lower() for g in genres}
+                if missing:
                     raise HTTPException(
                         status_code=400,
                         detail=f"Géneros no válidos: {sorted(missing)}",
@@ -103,8 +173,7 @@ class AlbumDAO:
 
 
         self.db.add(album)
-        self.db.commit()
-        self.db.refresh(album)
+        self.db.flush()  # para tener album.id; el commit lo hace get_db
         return album
 
     def update(self, album_id: int, *, update_data: Dict[str, Any]) -> Optional[Album]:
@@ -125,8 +194,7 @@ class AlbumDAO:
             if hasattr(album, field):
                 setattr(album, field, value)
 
-        self.db.commit()
-        self.db.refresh(album)
+        self.db.flush()
         return album
 
 
@@ -135,7 +203,7 @@ class AlbumDAO:
         if not album:
             return False
         self.db.delete(album)
-        self.db.commit()
+        self.db.flush()
         return True
 
 
@@ -145,14 +213,50 @@ class AlbumDAO:
         """
         # Hacemos un JOIN con la tabla intermedia AlbumArtistaLink
         # y filtramos por el email del artista.
-        # También cargamos las canciones y géneros para que 
+        # También cargamos las canciones (solo ids) y géneros para que
         # la respuesta JSON sea completa.
         q = self.db.query(Album)\
-        .options(
-            joinedload(Album.genres),
-            joinedload(Album.canciones)
-        )\
+        .options(*self._load_options(None))\
         .join(AlbumArtistaLink, Album.id == AlbumArtistaLink.album_id)\
         .filter(AlbumArtistaLink.artista_email == email_artista)
 
-        return q.all()
+        return self._attach_song_ids(q.all(), None)
+
+
+class AsyncAlbumDAO:
+    """Versión async de AlbumDAO (ver AsyncSongDAO)."""
+
+    # relaciones que necesita AlbumOut
+    _OUT_RELATIONS = ["genres", "canciones", "artistas_refs"]
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_albums(self, **kwargs) -> List[Album]:
+        return await self.db.run_sync(lambda s: AlbumDAO(s).list_albums(**kwargs))
+
+    async def get(self, album_id: int) -> Optional[Album]:
+        return await self.db.run_sync(lambda s: AlbumDAO(s).get(album_id))
+
+    async def get_song_ids(self, album_id: int) -> Optional[List[int]]:
+        return await self.db.run_sync(lambda s: AlbumDAO(s).get_song_ids(album_id))
+
+    async def get_by_artist(self, email_artista: str) -> List[Album]:
+        return await self.db.run_sync(lambda s: AlbumDAO(s).get_by_artist(email_artista))
+
+    async def create(self, **kwargs) -> Album:
+        def _create(s: Session) -> Album:
+            album = AlbumDAO(s).create(**kwargs)
+            ensure_loaded(s, album, self._OUT_RELATIONS)
+            return album
+
+        return await self.db.run_sync(_create)
+
+    async def update(self, album_id: int, *, update_data: Dict[str, Any]) -> Optional[Album]:
+        # AlbumDAO.update parte de get(), que ya precarga las relaciones
+        return await self.db.run_sync(
+            lambda s: AlbumDAO(s).update(album_id, update_data=update_data)
+        )
+
+    async def delete(self, album_id: int) -> bool:
+        return await self.db.run_sync(lambda s: AlbumDAO(s).delete(album_id))
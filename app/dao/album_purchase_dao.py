@@ -1,5 +1,6 @@
 # app/dao/album_purchase_dao.py
 from typing import Optional, List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.purchase import CompraAlbum
 from app.models.album import Album
@@ -45,7 +46,6 @@ class AlbumPurchaseDAO:
         )
         self.db.add(compra)
         self.db.flush()
-        self.db.refresh(compra)
         return compra
 
     # Identifica los IDs de los álbumes comprados por un usuario
@@ -57,3 +57,15 @@ class AlbumPurchaseDAO:
         )
         return [album_id for (album_id,) in rows]
 
+
+class AsyncAlbumPurchaseDAO:
+    """Versión async de AlbumPurchaseDAO (ver AsyncSongDAO)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def purchase_album(self, **kwargs) -> CompraAlbum:
+        return await self.db.run_sync(lambda s: AlbumPurchaseDAO(s).purchase_album(**kwargs))
+
+    async def list_user_album_ids(self, **kwargs) -> List[int]:
+        return await self.db.run_sync(lambda s: AlbumPurchaseDAO(s).list_user_album_ids(**kwargs))
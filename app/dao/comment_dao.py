@@ -1,5 +1,6 @@
 # app/dao/comment_dao.py
 from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.comment import Comment
 
@@ -22,8 +23,7 @@ class CommentDAO:
             album_id=album_id
         )
         self.db.add(comment)
-        self.db.commit()
-        self.db.refresh(comment)
+        self.db.flush()
         return comment
 
     def get_by_song(self, song_id: int) -> List[Comment]:
@@ -41,3 +41,19 @@ class CommentDAO:
             .order_by(Comment.created_at.desc())
             .all()
         )
+
+
+class AsyncCommentDAO:
+    """Versión async de CommentDAO (ver AsyncSongDAO)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, **kwargs) -> Comment:
+        return await self.db.run_sync(lambda s: CommentDAO(s).create(**kwargs))
+
+    async def get_by_song(self, song_id: int) -> List[Comment]:
+        return await self.db.run_sync(lambda s: CommentDAO(s).get_by_song(song_id))
+
+    async def get_by_album(self, album_id: int) -> List[Comment]:
+        return await self.db.run_sync(lambda s: CommentDAO(s).get_by_album(album_id))
@@ -0,0 +1,105 @@
+# app/dao/like_dao.py
+from typing import Iterable, List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.album import Album
+from app.models.like import AlbumLike, CancionLike
+from app.models.song import Cancion
+
+# tipo -> (modelo con numLikes, tabla de likes, columna que apunta al modelo)
+_TARGETS = {
+    "cancion": (Cancion, CancionLike, CancionLike.cancion_id),
+    "album": (Album, AlbumLike, AlbumLike.album_id),
+}
+# session.info: {tipo: {ids}} con likes que han cambiado en la transacción
+# (app.services.like_counter los agrega en numLikes tras el commit)
+LIKES_CHANGED_KEY = "likes_changed"
+
+
+class LikeDAO:
+    """
+    "Me gusta" de canciones y álbumes. Dar/quitar like solo toca la tabla de
+    likes (una fila por usuario); numLikes no se actualiza aquí sino por lotes
+    en recompute_counts, para que una canción viral no sea un punto caliente.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _note_changed(self, kind: str, target_id: int) -> None:
+        self.db.info.setdefault(LIKES_CHANGED_KEY, {}).setdefault(kind, set()).add(target_id)
+
+    def exists(self, kind: str, target_id: int) -> bool:
+        model = _TARGETS[kind][0]
+        return self.db.query(model.id).filter(model.id == target_id).first() is not None
+
+    def like(self, kind: str, target_id: int, user_ref: str) -> bool:
+        """
+        Registra el like (idempotente). Devuelve False si ya existía.
+        Lanza ValueError("not_found") si la canción/álbum no existe.
+        """
+        if not self.exists(kind, target_id):
+            raise ValueError("not_found")
+        _, like_model, target_col = _TARGETS[kind]
+        dialect = self.db.get_bind().dialect.name
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        # ON CONFLICT DO NOTHING: dos clics a la vez no chocan con la PK
+        result = self.db.execute(
+            insert(like_model)
+            .values({target_col.key: target_id, "user_ref": user_ref})
+            .on_conflict_do_nothing()
+        )
+        created = result.rowcount > 0
+        if created:
+            self._note_changed(kind, target_id)
+        return created
+
+    def unlike(self, kind: str, target_id: int, user_ref: str) -> bool:
+        """Quita el like. Devuelve False si no existía."""
+        _, like_model, target_col = _TARGETS[kind]
+        result = self.db.execute(
+            delete(like_model).where(target_col == target_id, like_model.user_ref == user_ref)
+        )
+        removed = result.rowcount > 0
+        if removed:
+            self._note_changed(kind, target_id)
+        return removed
+
+    def liked_ids(self, kind: str, user_ref: str, ids: Iterable[int]) -> List[int]:
+        """De `ids`, los que le gustan al usuario (una sola consulta por la PK)."""
+        ids = sorted({int(i) for i in ids})
+        if not ids:
+            return []
+        _, like_model, target_col = _TARGETS[kind]
+        rows = self.db.execute(
+            select(target_col).where(like_model.user_ref == user_ref, target_col.in_(ids))
+        )
+        return sorted(target_id for (target_id,) in rows)
+
+    def recompute_counts(self, kind: str, ids: Iterable[int]) -> int:
+        """
+        numLikes = nº de filas de likes, para esos ids y en un único UPDATE.
+        Es un valor absoluto (no un incremento): repetirlo o hacerlo desde
+        varios workers a la vez no descuadra nada. No hace commit.
+        """
+        ids = sorted(set(ids))
+        if not ids:
+            return 0
+        model, like_model, target_col = _TARGETS[kind]
+        count = (
+            select(func.count())
+            .select_from(like_model)
+            .where(target_col == model.id)
+            .scalar_subquery()
+        )
+        self.db.execute(
+            update(model)
+            .where(model.id.in_(ids))
+            .values(numLikes=count)
+            .execution_options(synchronize_session=False)
+        )
+        return len(ids)
@@ -0,0 +1,105 @@
+# app/dao/loaders.py
+# Utilidades de carga de relaciones compartidas por los DAOs.
+from typing import Iterable, Mapping
+
+from sqlalchemy import func, inspect, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from app.models.album import Album
+from app.models.song import Cancion
+
+# Perfiles de carga por esquema de salida ("<Esquema>-complete"): las
+# relaciones que lee el esquema al serializarse, todas con selectinload (una
+# consulta por relación para todo el resultado, también con LIMIT). Así cada
+# endpoint del catálogo hace un número fijo de consultas, sin cargas perezosas
+# por fila. Los ids de canciones de AlbumOut no están aquí: llegan con
+# attach_child_ids, sin cargar la relación.
+_PROFILES = {
+    "CancionOut-complete": (Cancion.genres, Cancion.artistas_refs),
+    "AlbumOut-complete": (Album.genres, Album.artistas_refs),
+}
+
+
+def ensure_loaded(db: Session, obj, relations: Iterable[str]) -> None:
+    """
+    Carga solo las relaciones de `obj` que aún no están en memoria (un SELECT
+    por relación pendiente, ninguno si ya vienen precargadas o asignadas).
+    Útil en las rutas async, donde una carga perezosa fuera del greenlet falla.
+    """
+    unloaded = inspect(obj).unloaded
+    pending = [name for name in relations if name in unloaded]
+    if pending:
+        db.refresh(obj, pending)
+
+
+def loader_profile(name: str, *, via=None) -> list:
+    """
+    Opciones de carga del perfil `name`. Con `via` (una relación) se cargan
+    los objetos de esa relación y, anidado, el perfil sobre ellos, p. ej.
+    loader_profile("CancionOut-complete", via=Album.canciones).
+    """
+    options = [selectinload(rel) for rel in _PROFILES[name]]
+    if via is None:
+        return options
+    return [selectinload(via).options(*options)]
+
+
+def field_options(
+    model,
+    fields: Iterable[str],
+    relation_loaders: Mapping[str, object],
+) -> list:
+    """
+    Opciones de carga para servir solo `fields` (sparse fieldsets): load_only de
+    las columnas pedidas y precarga solo de las relaciones de las que dependen
+    los campos pedidos (`relation_loaders`: campo del esquema -> opción de carga).
+    """
+    fields = set(fields)
+    column_attrs = inspect(model).column_attrs
+    columns = sorted(fields & set(column_attrs.keys())) or ["id"]
+    options = [load_only(*(getattr(model, name) for name in columns))]
+    for name in sorted(fields):
+        loader = relation_loaders.get(name)
+        if loader is not None:
+            options.append(loader)
+    return options
+
+
+def child_ids(db: Session, parent_col, child_col, parent_ids: Iterable[int], order_col=None) -> dict[int, list[int]]:
+    """
+    id del padre -> ids de los hijos (ordenados por `order_col`, o por el propio
+    id), en una sola consulta y sin instanciar objetos ORM. En PostgreSQL se
+    agregan en BD con array_agg; en el resto se agrupan aquí.
+    """
+    parent_ids = sorted(set(parent_ids))
+    if not parent_ids:
+        return {}
+    order_col = child_col if order_col is None else order_col
+    if db.get_bind().dialect.name == "postgresql":
+        rows = db.execute(
+            select(parent_col, func.array_agg(aggregate_order_by(child_col, order_col)))
+            .where(parent_col.in_(parent_ids))
+            .group_by(parent_col)
+        )
+        return {parent_id: list(ids) for parent_id, ids in rows}
+    rows = db.execute(
+        select(parent_col, child_col)
+        .where(parent_col.in_(parent_ids))
+        .order_by(parent_col, order_col)
+    )
+    grouped: dict[int, list[int]] = {}
+    for parent_id, id_ in rows:
+        grouped.setdefault(parent_id, []).append(id_)
+    return grouped
+
+
+def attach_child_ids(db: Session, objs: Iterable, attr: str, parent_col, child_col, order_col=None) -> None:
+    """
+    Deja en `attr` de cada objeto la lista de ids de sus hijos (ver child_ids)
+    para que el esquema de salida no tenga que cargar la relación entera.
+    """
+    objs = list(objs)
+    ids = child_ids(db, parent_col, child_col, (o.id for o in objs), order_col)
+    for obj in objs:
+        setattr(obj, attr, ids.get(obj.id, []))
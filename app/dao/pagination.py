@@ -0,0 +1,50 @@
+# app/dao/pagination.py
+# Paginación por cursor (keyset): el cliente recibe un token opaco con la
+# clave de orden y el id del último elemento, y la siguiente página empieza
+# justo después con un WHERE sobre el índice, sin OFFSET. Así la página 5.000
+# cuesta lo mismo que la 1.
+import base64
+import binascii
+import json
+from typing import Any
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 200
+
+# cabecera en la que las rutas devuelven el cursor de la página siguiente
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Cursor corrupto o generado para otra ordenación."""
+
+
+def encode_cursor(mode: str, key: Any, last_id: int) -> str:
+    payload = json.dumps({"m": mode, "k": key, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def _load(token: str) -> dict:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursor("Cursor no válido") from exc
+    if not isinstance(data, dict) or "m" not in data or "id" not in data:
+        raise InvalidCursor("Cursor no válido")
+    return data
+
+
+def cursor_mode(token: str) -> str:
+    """Modo de orden con el que se generó el cursor."""
+    return str(_load(token)["m"])
+
+
+def decode_cursor(token: str, mode: str) -> tuple[Any, int]:
+    """Devuelve (clave de orden, id) del cursor; valida que sea del mismo modo de orden."""
+    data = _load(token)
+    if data["m"] != mode:
+        raise InvalidCursor("El cursor no corresponde a esta ordenación")
+    try:
+        return data.get("k"), int(data["id"])
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Cursor no válido") from exc
@@ -3,27 +3,18 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.playlist import Playlist, PlaylistSong
 from app.models.song import Cancion as Song
+from app.dao.loaders import attach_child_ids, ensure_loaded
 
 
 class PlaylistDAO:
     def __init__(self, db: Session):
         self.db = db
 
-    def _get_next_position(self, playlist_id: int) -> int:
-        max_pos = (
-            self.db.query(func.max(PlaylistSong.position))
-            .filter(PlaylistSong.playlist_id == playlist_id)
-            .scalar()
-        )
-        if max_pos is None:
-            return 0
-        return int(max_pos) + 1
-
     def create(
         self,
         *,
@@ -37,8 +28,8 @@ class PlaylistDAO:
             name=name,
             description=description,
         )
+        playlist.songs = []
         self.db.add(playlist)
-        self.db.flush()  # para tener playlist.id
 
         if song_ids:
             # Validamos que las canciones existen
@@ -54,34 +45,50 @@ class PlaylistDAO:
                 if s_id in seen:
                     continue
                 seen.add(s_id)
-                link = PlaylistSong(
-                    playlist_id=playlist.id,
-                    cancion_id=s_id,
-                    position=pos,
-                )
-                self.db.add(link)
+                # vía la relación: playlist_id se rellena en el flush y
+                # playlist.songs queda al día sin volver a leerla
+                playlist.songs.append(PlaylistSong(cancion_id=s_id, position=pos))
                 pos += 1
 
         self.db.flush()
-        self.db.refresh(playlist)
         return playlist
 
+    def _attach_song_ids(self, playlists: List[Playlist]) -> List[Playlist]:
+        """song_ids de todas las playlists en una consulta, sin instanciar PlaylistSong."""
+        if playlists:
+            attach_child_ids(
+                self.db,
+                playlists,
+                "_song_ids",
+                PlaylistSong.playlist_id,
+                PlaylistSong.cancion_id,
+                PlaylistSong.position,
+            )
+        return playlists
+
     def get(self, playlist_id: int) -> Optional[Playlist]:
+        playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
+        if playlist is not None:
+            self._attach_song_ids([playlist])
+        return playlist
+
+    def _get_with_songs(self, playlist_id: int) -> Optional[Playlist]:
+        # para modificar la lista de canciones sí hacen falta los PlaylistSong
         return (
             self.db.query(Playlist)
-            .options(joinedload(Playlist.songs))
+            .options(selectinload(Playlist.songs))
             .filter(Playlist.id == playlist_id)
             .first()
         )
 
     def list_by_owner(self, owner_ref: str) -> List[Playlist]:
-        return (
+        playlists = (
             self.db.query(Playlist)
-            .options(joinedload(Playlist.songs))
             .filter(Playlist.owner_ref == owner_ref)
             .order_by(Playlist.created_at.desc())
             .all()
         )
+        return self._attach_song_ids(playlists)
 
     def delete(self, playlist_id: int) -> bool:
         playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
@@ -97,7 +104,7 @@ class PlaylistDAO:
         name: Optional[str] = None,
         description: Optional[str] = None,
     ) -> Optional[Playlist]:
-        playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
+        playlist = self.get(playlist_id)
         if not playlist:
             return None
 
@@ -106,13 +113,12 @@ class PlaylistDAO:
         if description is not None:
             playlist.description = description
 
-        self.db.flush()
-        self.db.refresh(playlist)
+        self.db.flush()  # updated_at vuelve en el RETURNING del UPDATE
         return playlist
 
     def add_song(self, playlist_id: int, song_id: int) -> Optional[Playlist]:
-        # Comprobamos que la playlist existe
-        playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
+        # Comprobamos que la playlist existe (con sus canciones)
+        playlist = self._get_with_songs(playlist_id)
         if not playlist:
             return None
 
@@ -124,44 +130,62 @@ class PlaylistDAO:
             raise ValueError("song_not_found")
 
         # ¿Ya estaba la canción?
-        link = (
-            self.db.query(PlaylistSong)
-            .filter(
-                PlaylistSong.playlist_id == playlist_id,
-                PlaylistSong.cancion_id == song_id,
-            )
-            .first()
-        )
-        if link is None:
-            pos = self._get_next_position(playlist_id)
-            link = PlaylistSong(
-                playlist_id=playlist_id,
-                cancion_id=song_id,
-                position=pos,
-            )
-            self.db.add(link)
+        if song_id not in playlist.song_ids:
+            # las canciones ya están cargadas: la siguiente posición sale de memoria
+            pos = max((ps.position for ps in playlist.songs), default=-1) + 1
+            playlist.songs.append(PlaylistSong(cancion_id=song_id, position=pos))
 
         self.db.flush()
-        self.db.refresh(playlist)
         return playlist
 
     def remove_song(self, playlist_id: int, song_id: int) -> Optional[Playlist]:
-        playlist = self.db.query(Playlist).filter(Playlist.id == playlist_id).first()
+        playlist = self._get_with_songs(playlist_id)
         if not playlist:
             return None
 
-        link = (
-            self.db.query(PlaylistSong)
-            .filter(
-                PlaylistSong.playlist_id == playlist_id,
-                PlaylistSong.cancion_id == song_id,
-            )
-            .first()
-        )
+        # delete-orphan: quitarla de la relación la borra en el flush
+        link = next((ps for ps in playlist.songs if ps.cancion_id == song_id), None)
         if link:
-            self.db.delete(link)
+            playlist.songs.remove(link)
 
         self.db.flush()
-        self.db.refresh(playlist)
         return playlist
 
+
+class AsyncPlaylistDAO:
+    """Versión async de PlaylistDAO (ver AsyncSongDAO)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run_loaded(self, fn) -> Optional[Playlist]:
+        # PlaylistOut necesita `songs` cargado dentro del greenlet
+        def _call(s: Session) -> Optional[Playlist]:
+            playlist = fn(PlaylistDAO(s))
+            if playlist is not None:
+                ensure_loaded(s, playlist, ["songs"])
+            return playlist
+
+        return await self.db.run_sync(_call)
+
+    async def create(self, **kwargs) -> Playlist:
+        return await self._run_loaded(lambda dao: dao.create(**kwargs))
+
+    async def get(self, playlist_id: int) -> Optional[Playlist]:
+        return await self.db.run_sync(lambda s: PlaylistDAO(s).get(playlist_id))
+
+    async def list_by_owner(self, owner_ref: str) -> List[Playlist]:
+        return await self.db.run_sync(lambda s: PlaylistDAO(s).list_by_owner(owner_ref))
+
+    async def delete(self, playlist_id: int) -> bool:
+        return await self.db.run_sync(lambda s: PlaylistDAO(s).delete(playlist_id))
+
+    async def update(self, playlist_id: int, **kwargs) -> Optional[Playlist]:
+        # update parte de get(), que ya deja los song_ids
+        return await self.db.run_sync(lambda s: PlaylistDAO(s).update(playlist_id, **kwargs))
+
+    async def add_song(self, playlist_id: int, song_id: int) -> Optional[Playlist]:
+        return await self._run_loaded(lambda dao: dao.add_song(playlist_id, song_id))
+
+    async def remove_song(self, playlist_id: int, song_id: int) -> Optional[Playlist]:
+        return await self._run_loaded(lambda dao: dao.remove_song(playlist_id, song_id))
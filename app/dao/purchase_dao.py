@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from typing import Iterable, List, Optional, Dict, Set
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -43,7 +44,6 @@ class PurchaseDAO:
         )
         self.db.add(obj)
         self.db.flush()
-        self.db.refresh(obj)
         return obj
 
     def has_purchase(self, *, song_id: int, user_ref: str) -> bool:
@@ -72,3 +72,23 @@ class PurchaseDAO:
         ).scalar() or 0
 
 
+class AsyncPurchaseDAO:
+    """Versión async de PurchaseDAO (ver AsyncSongDAO)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def purchase(self, **kwargs) -> CompraCancion:
+        return await self.db.run_sync(lambda s: PurchaseDAO(s).purchase(**kwargs))
+
+    async def has_purchase(self, **kwargs) -> bool:
+        return await self.db.run_sync(lambda s: PurchaseDAO(s).has_purchase(**kwargs))
+
+    async def list_user_song_ids(self, **kwargs) -> List[int]:
+        return await self.db.run_sync(lambda s: PurchaseDAO(s).list_user_song_ids(**kwargs))
+
+    async def list_user_purchases(self, **kwargs) -> List[CompraCancion]:
+        return await self.db.run_sync(lambda s: PurchaseDAO(s).list_user_purchases(**kwargs))
+
+    async def count_song_purchases(self, **kwargs) -> int:
+        return await self.db.run_sync(lambda s: PurchaseDAO(s).count_song_purchases(**kwargs))
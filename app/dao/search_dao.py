@@ -0,0 +1,97 @@
+# app/dao/search_dao.py
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, func, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.dao.pagination import DEFAULT_LIMIT, InvalidCursor, decode_cursor, encode_cursor
+from app.models.search import BusquedaIndice
+from app.services.search_index import normalize
+
+_CURSOR_MODE = "buscar"
+
+
+class SearchDAO:
+    """
+    Búsqueda de texto sobre el índice `busqueda` (canciones y álbumes: títulos,
+    géneros y emails de artistas). En Postgres usa el tsvector + GIN con ranking
+    ts_rank_cd; en SQLite, LIKE por término sobre el texto normalizado.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _is_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _match_and_rank(self, q: str):
+        if self._is_postgres():
+            cfg = cast(literal(settings.search_ts_config), REGCONFIG)
+            query = func.websearch_to_tsquery(cfg, normalize(q))
+            match = BusquedaIndice.documento.op("@@")(query)
+            rank = cast(func.ts_rank_cd(BusquedaIndice.documento, query), Float)
+            return match, rank
+
+        terms = normalize(q).split()
+        if not terms:
+            return None, None
+        escaped = [t.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") for t in terms]
+        match = and_(*(BusquedaIndice.texto.like(f"%{t}%", escape="\\") for t in escaped))
+        # ranking sencillo: primero los que empiezan por el primer término
+        # (el texto empieza por el título)
+        rank = case((BusquedaIndice.texto.like(f"{escaped[0]}%", escape="\\"), 1.0), else_=0.5)
+        return match, cast(rank, Float)
+
+    def search(
+        self,
+        q: str,
+        *,
+        tipo: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Resultados ordenados por relevancia (rank, tipo, id descendentes) y el
+        cursor de la página siguiente. Lanza InvalidCursor si no es válido.
+        """
+        match, rank = self._match_and_rank(q)
+        if match is None:
+            return [], None
+
+        rank = rank.label("rank")
+        query = self.db.query(
+            BusquedaIndice.tipo, BusquedaIndice.ref_id, BusquedaIndice.titulo, rank
+        ).filter(match)
+        if tipo:
+            query = query.filter(BusquedaIndice.tipo == tipo)
+
+        if cursor:
+            key, last_id = decode_cursor(cursor, _CURSOR_MODE)
+            try:
+                last_rank, last_tipo = float(key[0]), str(key[1])
+            except (TypeError, ValueError, IndexError, KeyError) as exc:
+                raise InvalidCursor("Cursor no válido") from exc
+            query = query.filter(
+                or_(
+                    rank < last_rank,
+                    and_(
+                        rank == last_rank,
+                        tuple_(BusquedaIndice.tipo, BusquedaIndice.ref_id) < (last_tipo, last_id),
+                    ),
+                )
+            )
+
+        rows = (
+            query.order_by(rank.desc(), BusquedaIndice.tipo.desc(), BusquedaIndice.ref_id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        hits = [
+            {"tipo": r.tipo, "id": r.ref_id, "titulo": r.titulo, "rank": r.rank} for r in rows[:limit]
+        ]
+        if len(rows) <= limit:
+            return hits, None
+        last = hits[-1]
+        return hits, encode_cursor(_CURSOR_MODE, [last["rank"], last["tipo"]], last["id"])
@@ -1,9 +1,50 @@
 # app/dao/song_dao.py
-from typing import List, Optional, Dict, Any, Iterable
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable, Mapping, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import bindparam, exists, func, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.models.song import Cancion as Song
 from app.models.genre import Genre
+from app.models.associations import cancion_genero
+from app.models.ranking import GLOBAL_RANKING, RANKING_KINDS, CancionRanking
+from app.models.trending import CancionReproduccionHora, CancionTendencia
+from app.dao.loaders import ensure_loaded, field_options, loader_profile
+from app.services.genre_registry import genre_registry
+from app.dao.pagination import (
+    DEFAULT_LIMIT,
+    InvalidCursor,
+    cursor_mode,
+    decode_cursor,
+    encode_cursor,
+)
+
+# popularidad -> (clave de orden, descendente); el id siempre desempata.
+# Índices de apoyo: ix_cancion_likes_id (y la PK para id). tendencia ordena por
+# la puntuación con decaimiento que precalcula app.services.trending (nunca por
+# los eventos crudos). top/tendencia solo se ordenan en vivo si el ranking
+# precalculado no sirve.
+_TREND_SCORE = func.coalesce(CancionTendencia.score, 0.0)
+_SORTS = {
+    "top": (Song.numLikes, True),
+    "tendencia": (_TREND_SCORE, True),
+    "reciente": (None, True),
+    "id": (None, False),
+}
+# tablas que hay que unir para tener la clave de orden
+_SORT_JOINS = {
+    "tendencia": (CancionTendencia, CancionTendencia.cancion_id == Song.id),
+}
+_DEFAULT_SORT = "id"
+
+# campos de CancionOut que dependen de una relación (para ?fields=)
+_FIELD_LOADERS = {
+    "generos": selectinload(Song.genres),
+    "artistas_emails": selectinload(Song.artistas_refs),
+}
+
 
 class SongDAO:
     def __init__(self, db: Session):
@@ -25,19 +66,148 @@ class SongDAO:
         return path.lstrip("/")
 
     def list_songs(self, *, genero: Optional[str] = None, popularidad: Optional[str] = None):
-        q = self.db.query(Song).options(joinedload(Song.genres))
-        if genero:
-            q = (
-                q.join(Song.genres)
-                .filter(func.lower(Genre.name).like(f"%{genero.lower()}%"))
+        songs, _ = self.list_songs_page(genero=genero, popularidad=popularidad)
+        return songs
+
+    def list_songs_page(
+        self,
+        *,
+        genero: Optional[str] = None,
+        popularidad: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[Song], Optional[str]]:
+        """
+        Página de canciones ordenada por (clave de popularidad, id) y el cursor
+        de la siguiente (None si es la última). top/tendencia se sirven del
+        ranking precalculado cuando lo hay. Con `fields` solo se cargan esas
+        columnas y relaciones. Lanza InvalidCursor si el cursor no es válido o
+        es de otra ordenación.
+        """
+        mode = popularidad if popularidad in _SORTS else _DEFAULT_SORT
+        key_col, descending = _SORTS[mode]
+
+        genre_ids: Optional[List[int]] = None
+        if genero and genero.strip():
+            genre_ids = self.resolve_genre_ids(genero)
+            if not genre_ids:
+                return [], None
+
+        # top/tendencia salen del ranking precalculado (global o de un género);
+        # si aún no se ha calculado, o el filtro abarca varios géneros, en vivo
+        if mode in RANKING_KINDS and (genre_ids is None or len(genre_ids) == 1):
+            ranking_genre = genre_ids[0] if genre_ids else GLOBAL_RANKING
+            page = self._ranked_page(
+                mode, ranking_genre, cursor=cursor, limit=limit, fields=fields
             )
-        if popularidad == "top":
-            q = q.order_by(Song.numLikes.desc())
-        elif popularidad == "tendencia":
-            q = q.order_by(Song.numVisualizaciones.desc())
-        elif popularidad == "reciente":
-            q = q.order_by(Song.id.desc())
-        return q.distinct().limit(200).all()
+            if page is not None:
+                return page
+
+        # selectinload (no joinedload): con LIMIT, un JOIN a una colección obliga
+        # a envolver la consulta en una subconsulta y a reordenar fuera
+        if key_col is not None:
+            # la clave de orden se lee junto a la fila para construir el cursor
+            q = self.db.query(Song, key_col.label("sort_key"))
+        else:
+            q = self.db.query(Song)
+        q = q.options(*self._load_options(fields))
+        if mode in _SORT_JOINS:
+            q = q.outerjoin(*_SORT_JOINS[mode])
+        if genre_ids:
+            # EXISTS sobre cancion_genero (índice genre_id, cancion_id): sin JOIN
+            # ni DISTINCT sobre filas anchas
+            q = q.filter(
+                exists().where(
+                    cancion_genero.c.cancion_id == Song.id,
+                    cancion_genero.c.genre_id.in_(genre_ids),
+                )
+            )
+
+        # keyset: seguimos justo después del último elemento de la página anterior
+        if cursor:
+            key, last_id = decode_cursor(cursor, mode)
+            if key_col is not None:
+                if not isinstance(key, (int, float)) or isinstance(key, bool):
+                    raise InvalidCursor("Cursor no válido")
+                q = q.filter(tuple_(key_col, Song.id) < tuple_(literal(key), literal(last_id)))
+            elif descending:
+                q = q.filter(Song.id < last_id)
+            else:
+                q = q.filter(Song.id > last_id)
+
+        if key_col is not None:
+            q = q.order_by(key_col.desc(), Song.id.desc())
+        else:
+            q = q.order_by(Song.id.desc() if descending else Song.id.asc())
+
+        # una fila de más para saber si hay página siguiente
+        rows = q.limit(limit + 1).all()
+        if key_col is not None:
+            songs, keys = [song for song, _ in rows], [key for _, key in rows]
+        else:
+            songs, keys = rows, [None] * len(rows)
+        if len(songs) <= limit:
+            return songs, None
+        songs = songs[:limit]
+        return songs, encode_cursor(mode, keys[limit - 1], songs[-1].id)
+
+    def _ranked_page(
+        self,
+        kind: str,
+        genre_id: int,
+        *,
+        cursor: Optional[str],
+        limit: int,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Optional[Tuple[List[Song], Optional[str]]]:
+        """
+        Página servida desde cancion_ranking. None si hay que ir en vivo: el
+        ranking está vacío o el cursor es de una página servida en vivo.
+        """
+        ranked_mode = f"{kind}@{genre_id}"
+        after_rank = 0
+        if cursor:
+            if cursor_mode(cursor) != ranked_mode:
+                return None
+            after_rank, _ = decode_cursor(cursor, ranked_mode)
+            if not isinstance(after_rank, int) or isinstance(after_rank, bool):
+                raise InvalidCursor("Cursor no válido")
+
+        rows = (
+            self.db.query(Song, CancionRanking.rank)
+            .join(CancionRanking, CancionRanking.cancion_id == Song.id)
+            .options(*self._load_options(fields))
+            .filter(
+                CancionRanking.kind == kind,
+                CancionRanking.genre_id == genre_id,
+                CancionRanking.rank > after_rank,
+            )
+            .order_by(CancionRanking.rank)
+            .limit(limit + 1)
+            .all()
+        )
+        if not rows and not cursor:
+            return None
+        if len(rows) <= limit:
+            return [song for song, _ in rows], None
+        rows = rows[:limit]
+        last_song, last_rank = rows[-1]
+        return [song for song, _ in rows], encode_cursor(ranked_mode, last_rank, last_song.id)
+
+    @staticmethod
+    def _load_options(fields: Optional[Iterable[str]]) -> list:
+        """Precarga completa para CancionOut, o solo lo que piden `fields`."""
+        if fields is None:
+            return loader_profile("CancionOut-complete")
+        return field_options(Song, fields, _FIELD_LOADERS)
+
+    def resolve_genre_ids(self, genero: str) -> List[int]:
+        """
+        Ids de los géneros que corresponden al filtro `genero` (sin distinguir
+        mayúsculas): el de nombre exacto si existe; si no, los que empiezan por él.
+        """
+        return genre_registry.ids_matching(self.db, genero)
 
     def create(
         self,
@@ -61,28 +231,25 @@ class SongDAO:
         )
 
         if genre_names:
-            norm = [g.strip().lower() for g in genre_names if g and g.strip()]
-            if norm:
-                found = (
-                    self.db.query(Genre)
-                    .filter(func.lower(Genre.name).in_(norm))
-                    .all()
-                )
+            found = genre_registry.get_genres(self.db, genre_names)
+            if found:
                 song.set_genres(found)
 
         if artistas_emails:
             song.set_artistas_emails(artistas_emails)
 
         self.db.add(song)
-        self.db.flush()
-        self.db.refresh(song)
+        self.db.flush()  # el commit lo hace get_db al final de la request
         return song
 
+    def get_genres_by_names(self, names: Iterable[str]) -> List[Genre]:
+        return genre_registry.get_genres(self.db, names)
+
     # RF 4.3
-    def get(self, song_id: int) -> Optional[Song]:
+    def get(self, song_id: int, *, fields: Optional[Iterable[str]] = None) -> Optional[Song]:
         return (
             self.db.query(Song)
-            .options(joinedload(Song.genres))
+            .options(*self._load_options(fields))
             .filter(Song.id == song_id)
             .one_or_none()
         )
@@ -104,24 +271,21 @@ class SongDAO:
 
         # actualizar géneros si vienen
         if "generos" in update_data and update_data["generos"] is not None:
-            names = [g.strip().lower() for g in update_data["generos"] if g and g.strip()]
-            found = []
-            if names:
-                found = (
-                    self.db.query(Genre)
-                    .filter(func.lower(Genre.name).in_(names))
-                    .all()
-                )
+            found = genre_registry.get_genres(self.db, update_data["generos"])
             song.set_genres(found)
             update_data.pop("generos", None)  # ya aplicado
 
+        # artistas_emails es una propiedad de solo lectura: se reasigna con el helper
+        if update_data.get("artistas_emails") is not None:
+            song.set_artistas_emails(update_data.pop("artistas_emails"))
+        update_data.pop("artistas_emails", None)
+
         # actualizar el resto de campos “planos”
         for field, value in list(update_data.items()):
             if hasattr(song, field) and field not in {"id"}:
                 setattr(song, field, value)
 
-        self.db.commit()
-        self.db.refresh(song)
+        self.db.flush()
         return song
 
     def delete(self, song_id: int) -> bool:
@@ -129,7 +293,7 @@ class SongDAO:
         if not song:
             return False
         self.db.delete(song)
-        self.db.commit()
+        self.db.flush()
         return True
 
     def get_many(self, ids: Iterable[int]) -> List[Song]:
@@ -138,37 +302,144 @@ class SongDAO:
             return []
         return (
             self.db.query(Song)
-            .options(
-                joinedload(Song.genres),
-                joinedload(Song.artistas_refs),  # precarga para propiedad
-            )
+            .options(*loader_profile("CancionOut-complete"))
             .filter(Song.id.in_(ids))
             .all()
         )
 
+    def get_many_ordered(self, ids: Iterable[int]) -> Tuple[List[Song], List[int]]:
+        """
+        Canciones de `ids` en el orden pedido (sin repetidas) y los ids que no
+        existen, con una sola consulta (más la precarga de relaciones).
+        """
+        wanted = list(dict.fromkeys(int(i) for i in ids))
+        by_id = {song.id: song for song in self.get_many(wanted)}
+        found = [by_id[i] for i in wanted if i in by_id]
+        missing = [i for i in wanted if i not in by_id]
+        return found, missing
+
     def get_by_artist(self, email_artista: str) -> List[Song]:
         return (
             self.db.query(Song)
-            .options(joinedload(Song.genres))
+            .options(*loader_profile("CancionOut-complete"))
             .filter(Song.artistas_refs.any(artista_email=email_artista))
             .all()
         )
 
-    # incrementa numVisualizaciones de una canción
-    def increment_views(self, song_id: int, amount: int = 1):
-        song = (
-            self.db.query(Song)
-            .filter(Song.id == song_id)
-            .first()
+    def exists(self, song_id: int) -> bool:
+        return self.db.query(Song.id).filter(Song.id == song_id).first() is not None
+
+    def add_views(self, counts: Mapping[int, int]) -> int:
+        """
+        Suma reproducciones a varias canciones con un único UPDATE ejecutado
+        por lotes (executemany), en orden de id para que dos workers que
+        vuelcan a la vez no se bloqueen en orden cruzado. No hace commit.
+        Devuelve el nº de canciones volcadas (las ya borradas no actualizan nada).
+        """
+        params = [
+            {"song_id": song_id, "amount": amount}
+            for song_id, amount in sorted(counts.items())
+            if amount
+        ]
+        if not params:
+            return 0
+        table = Song.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("song_id"))
+            .values(
+                numVisualizaciones=func.coalesce(table.c.numVisualizaciones, 0)
+                + bindparam("amount")
+            )
         )
-        if not song:
-            return None
+        self.db.connection().execute(stmt, params)
+        return len(params)
 
-        # Si está a NULL se inicializa a 0
-        current = getattr(song, "numVisualizaciones", 0) or 0
-        song.numVisualizaciones = current + amount
+    def add_play_buckets(self, counts: Mapping[int, int], hora: datetime) -> int:
+        """
+        Suma reproducciones a la franja horaria `hora` de cada canción con un
+        único upsert (INSERT ... ON CONFLICT DO UPDATE). Las canciones que ya no
+        existen se descartan. No hace commit. Devuelve el nº de filas escritas.
+        """
+        wanted = sorted(song_id for song_id, amount in counts.items() if amount)
+        if not wanted:
+            return 0
+        existing = {
+            song_id for (song_id,) in self.db.query(Song.id).filter(Song.id.in_(wanted))
+        }
+        values = [
+            {"cancion_id": song_id, "hora": hora, "reproducciones": counts[song_id]}
+            for song_id in wanted
+            if song_id in existing
+        ]
+        if not values:
+            return 0
+        dialect = self.db.get_bind().dialect.name
+        upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = upsert(CancionReproduccionHora).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CancionReproduccionHora.cancion_id, CancionReproduccionHora.hora],
+            set_={
+                "reproducciones": CancionReproduccionHora.reproducciones
+                + stmt.excluded.reproducciones
+            },
+        )
+        self.db.execute(stmt)
+        return len(values)
 
-        self.db.commit()
-        self.db.refresh(song)
-        return song
+
+# relaciones que necesita CancionOut
+_OUT_RELATIONS = ["genres", "artistas_refs"]
+
+
+class AsyncSongDAO:
+    """
+    Versión async de SongDAO para rutas `async def`: ejecuta el DAO síncrono sobre
+    la conexión async (run_sync), así no se bloquea el event loop y la lógica no se duplica.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_songs(self, **kwargs) -> List[Song]:
+        return await self.db.run_sync(lambda s: SongDAO(s).list_songs(**kwargs))
+
+    async def list_songs_page(self, **kwargs) -> Tuple[List[Song], Optional[str]]:
+        return await self.db.run_sync(lambda s: SongDAO(s).list_songs_page(**kwargs))
+
+    async def get(self, song_id: int) -> Optional[Song]:
+        return await self.db.run_sync(lambda s: SongDAO(s).get(song_id))
+
+    async def get_many(self, ids: Iterable[int]) -> List[Song]:
+        ids = list(ids)
+        return await self.db.run_sync(lambda s: SongDAO(s).get_many(ids))
+
+    async def get_many_ordered(self, ids: Iterable[int]) -> Tuple[List[Song], List[int]]:
+        ids = list(ids)
+        return await self.db.run_sync(lambda s: SongDAO(s).get_many_ordered(ids))
+
+    async def get_by_artist(self, email_artista: str) -> List[Song]:
+        return await self.db.run_sync(lambda s: SongDAO(s).get_by_artist(email_artista))
+
+    async def get_genres_by_names(self, names: Iterable[str]) -> List[Genre]:
+        names = list(names)
+        return await self.db.run_sync(lambda s: SongDAO(s).get_genres_by_names(names))
+
+    async def create(self, **kwargs) -> Song:
+        def _create(s: Session) -> Song:
+            song = SongDAO(s).create(**kwargs)
+            # relaciones que necesita CancionOut, cargadas dentro del greenlet
+            ensure_loaded(s, song, _OUT_RELATIONS)
+            return song
+
+        return await self.db.run_sync(_create)
+
+    async def update(self, song_id: int, *, update_data: Dict[str, Any]) -> Optional[Song]:
+        # SongDAO.update parte de get(), que ya precarga las relaciones
+        return await self.db.run_sync(
+            lambda s: SongDAO(s).update(song_id, update_data=update_data)
+        )
+
+    async def delete(self, song_id: int) -> bool:
+        return await self.db.run_sync(lambda s: SongDAO(s).delete(song_id))
 
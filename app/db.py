@@ -1,23 +1,188 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import itertools
+import threading
+import time
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from .config import settings
+from .db_pool import TimedAsyncQueuePool, TimedQueuePool
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith("sqlite:"))
+
+
+def _engine_kwargs(url: str, poolclass=TimedQueuePool) -> dict:
+    # SQLite en memoria usa su propio pool (una conexión); no admite QueuePool
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
 
-engine = create_engine(settings.database_url, future=True)
+def _async_url(url: str) -> str:
+    """Driver async equivalente a DATABASE_URL (psycopg 3 ya es async)."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+engine = create_engine(settings.database_url, future=True, **_engine_kwargs(settings.database_url))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
+# réplicas de lectura (round-robin)
+replica_engines = [
+    create_engine(url, future=True, **_engine_kwargs(url)) for url in settings.read_replica_urls
+]
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+_replica_lock = threading.Lock()
+
+# cookie con la que un cliente que acaba de escribir lee del primario (read-your-writes)
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+ASYNC_DATABASE_URL = settings.async_database_url or _async_url(settings.database_url)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_engine_kwargs(ASYNC_DATABASE_URL, TimedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
+@event.listens_for(Session, "after_flush")
+def _mark_write(session: Session, flush_context) -> None:
+    # vale también para las sesiones async (su sync_session es una Session)
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state) -> None:
+    # INSERT/UPDATE/DELETE lanzados con session.execute (likes, contadores...)
+    # no pasan por el flush, pero también escriben
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def _mark_request_wrote(request: Request | None, db: Session) -> None:
+    if request is not None and db.info.get("wrote"):
+        request.state.db_wrote = True
+
+
+def get_db(request: Request = None):
     db = SessionLocal()
     try:
         yield db
         db.commit() # commit al final de la request
+        _mark_request_wrote(request, db)
     except:
         db.rollback()
         raise
     finally:
         db.close()
+
+
+def _pinned_to_primary(request: Request | None) -> bool:
+    if request is None:
+        return False
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def _read_engine(request: Request | None):
+    # db_primary_read: la caché de respuestas pide leer del primario lo que va a guardar
+    if (
+        _replica_cycle is None
+        or _pinned_to_primary(request)
+        or (request is not None and getattr(request.state, "db_primary_read", False))
+    ):
+        return engine
+    with _replica_lock:
+        return next(_replica_cycle)
+
+
+def get_read_db(request: Request = None):
+    """
+    Sesión para rutas de solo lectura del catálogo: va a una réplica (round-robin),
+    salvo que el cliente haya escrito hace poco (cookie de read-your-writes).
+    """
+    db = SessionLocal(bind=_read_engine(request))
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
+
+def pin_to_primary(request: Request, response) -> None:
+    """Si la petición escribió en BD, las siguientes lecturas del cliente irán al primario."""
+    if replica_engines and getattr(request.state, "db_wrote", False):
+        until = time.time() + settings.read_your_writes_window
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE,
+            f"{until:.3f}",
+            max_age=max(1, int(settings.read_your_writes_window)),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+async def get_async_db(request: Request = None):
+    # igual que get_db, pero sin bloquear el event loop (rutas async def)
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+            _mark_request_wrote(request, db.sync_session)
+        except:
+            await db.rollback()
+            raise
+
+
+def warm_up_pool() -> None:
+    """Abre pool_size conexiones al arrancar para no pagarlas en las primeras peticiones."""
+    conns = []
+    try:
+        for _ in range(settings.db_pool_size):
+            conns.append(engine.connect())
+    finally:
+        for c in conns:
+            c.close()
+
+
+def _stats(pool) -> dict:
+    if isinstance(pool, TimedQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+def pool_stats() -> dict:
+    return _stats(engine.pool)
+
+
+def async_pool_stats() -> dict:
+    return _stats(async_engine.pool)
+
+
+def replica_pool_stats() -> list[dict]:
+    return [
+        {"url": e.url.render_as_string(hide_password=True), **_stats(e.pool)}
+        for e in replica_engines
+    ]
@@ -0,0 +1,137 @@
+# app/db_metrics.py
+# Instrumentación SQL por petición: nº de sentencias, tiempo total, la más lenta
+# y (en desarrollo) detección de patrones N+1.
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, raiseload
+
+from app.config import settings
+
+logger = logging.getLogger("app.sql")
+
+
+@dataclass
+class RequestSQLStats:
+    count: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+    slowest_statement: str = ""
+    # sentencia -> nº de ejecuciones (solo con la detección de N+1 activa)
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+        if settings.sql_n1_detection:
+            self.statements[statement] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Sentencias idénticas repetidas >= umbral: candidatas a N+1."""
+        return [
+            (stmt, n)
+            for stmt, n in self.statements.most_common()
+            if n >= settings.sql_n1_threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total * 1000:.2f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("sql_stats", default=None)
+_raise_on_lazy: ContextVar[bool] = ContextVar("sql_raise_on_lazy", default=False)
+
+
+def current_stats() -> Optional[RequestSQLStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_sql() -> Iterator[RequestSQLStats]:
+    """Acumula las sentencias SQL ejecutadas dentro del bloque (y de las tareas/hilos que lance)."""
+    stats = RequestSQLStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def raise_on_lazy_load() -> Iterator[None]:
+    """
+    Dentro del bloque, cualquier carga perezosa de una relación lanza excepción
+    (equivale a lazy="raise" en todas las relaciones). Pensado para tests.
+    """
+    token = _raise_on_lazy.set(True)
+    try:
+        yield
+    finally:
+        _raise_on_lazy.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("sql_t0", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("sql_t0")
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_raiseload(orm_execute_state) -> None:
+    if not (settings.sql_raise_on_lazy_load or _raise_on_lazy.get()):
+        return
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        # las opciones explícitas (joinedload/selectinload) siguen mandando sobre el comodín
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+def log_request(method: str, path: str, status_code: int, stats: RequestSQLStats) -> None:
+    logger.info(
+        "%s %s -> %s: %d queries, %.2f ms",
+        method,
+        path,
+        status_code,
+        stats.count,
+        stats.total * 1000,
+        extra={
+            "sql_count": stats.count,
+            "sql_time_ms": round(stats.total * 1000, 3),
+            "sql_slowest_ms": round(stats.slowest * 1000, 3),
+            "sql_slowest": stats.slowest_statement[:500],
+        },
+    )
+    if settings.sql_n1_detection:
+        for statement, n in stats.repeated():
+            logger.warning(
+                "Posible N+1 en %s %s: sentencia repetida %d veces: %s",
+                method,
+                path,
+                n,
+                statement[:500],
+                extra={"sql_n1_count": n, "sql_n1_statement": statement[:500]},
+            )
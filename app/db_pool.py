@@ -0,0 +1,55 @@
+# app/db_pool.py
+# QueuePool instrumentado: mide cuánto esperan las peticiones por una conexión.
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - t0
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": self.overflow(),
+                "max_overflow": self._max_overflow,
+                "timeout": self._timeout,
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": (self.wait_total / checkouts * 1000) if checkouts else 0.0,
+                "wait_ms_max": self.wait_max * 1000,
+            }
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """Misma instrumentación para el engine async (cola compatible con asyncio)."""
@@ -1,10 +1,20 @@
 # app/factories/album.py
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, get_async_db, get_read_db
 
-from app.dao.album_dao import AlbumDAO
+from app.dao.album_dao import AlbumDAO, AsyncAlbumDAO
 
 
 def get_album_dao(db: Session = Depends(get_db)):
     return AlbumDAO(db)
+
+
+# lecturas del catálogo: pueden ir a una réplica
+def get_album_read_dao(db: Session = Depends(get_read_db)) -> AlbumDAO:
+    return AlbumDAO(db)
+
+
+def get_async_album_dao(db: AsyncSession = Depends(get_async_db)) -> AsyncAlbumDAO:
+    return AsyncAlbumDAO(db)
@@ -1,8 +1,15 @@
 # app/factories/comment.py
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import get_db
-from app.dao.comment_dao import CommentDAO
+from app.db import get_db, get_async_db, get_read_db
+from app.dao.comment_dao import CommentDAO, AsyncCommentDAO
 
 def get_comment_dao(db: Session = Depends(get_db)) -> CommentDAO:
     return CommentDAO(db)
+
+def get_comment_read_dao(db: Session = Depends(get_read_db)) -> CommentDAO:
+    return CommentDAO(db)
+
+def get_async_comment_dao(db: AsyncSession = Depends(get_async_db)) -> AsyncCommentDAO:
+    return AsyncCommentDAO(db)
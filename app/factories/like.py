@@ -0,0 +1,13 @@
+# app/factories/like.py
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from app.db import get_db, get_read_db
+from app.dao.like_dao import LikeDAO
+
+
+def get_like_dao(db: Session = Depends(get_db)) -> LikeDAO:
+    return LikeDAO(db)
+
+
+def get_like_read_dao(db: Session = Depends(get_read_db)) -> LikeDAO:
+    return LikeDAO(db)
@@ -1,11 +1,16 @@
 # app/factories/playlist.py
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.dao.playlist_dao import PlaylistDAO
+from app.db import get_db, get_async_db
+from app.dao.playlist_dao import PlaylistDAO, AsyncPlaylistDAO
 
 
 def get_playlist_dao(db: Session = Depends(get_db)) -> PlaylistDAO:
     return PlaylistDAO(db)
 
+
+def get_async_playlist_dao(db: AsyncSession = Depends(get_async_db)) -> AsyncPlaylistDAO:
+    return AsyncPlaylistDAO(db)
+
@@ -1,12 +1,19 @@
 # app/factories/purchase.py
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import get_db
-from app.dao.purchase_dao import PurchaseDAO
-from app.dao.album_purchase_dao import AlbumPurchaseDAO
+from app.db import get_db, get_async_db
+from app.dao.purchase_dao import PurchaseDAO, AsyncPurchaseDAO
+from app.dao.album_purchase_dao import AlbumPurchaseDAO, AsyncAlbumPurchaseDAO
 
 def get_purchase_dao(db: Session = Depends(get_db)) -> PurchaseDAO:
     return PurchaseDAO(db)
 
 def get_album_purchase_dao(db: Session = Depends(get_db)) -> AlbumPurchaseDAO:
     return AlbumPurchaseDAO(db)
+
+def get_async_purchase_dao(db: AsyncSession = Depends(get_async_db)) -> AsyncPurchaseDAO:
+    return AsyncPurchaseDAO(db)
+
+def get_async_album_purchase_dao(db: AsyncSession = Depends(get_async_db)) -> AsyncAlbumPurchaseDAO:
+    return AsyncAlbumPurchaseDAO(db)
@@ -0,0 +1,9 @@
+# app/factories/search.py
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from app.db import get_read_db
+from app.dao.search_dao import SearchDAO
+
+
+def get_search_read_dao(db: Session = Depends(get_read_db)) -> SearchDAO:
+    return SearchDAO(db)
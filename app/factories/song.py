@@ -1,10 +1,20 @@
 # app/factories/song.py  
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_db, get_async_db, get_read_db
+
+from app.dao.song_dao import SongDAO, AsyncSongDAO
 
-from app.dao.song_dao import SongDAO 
 
 def get_song_dao(db: Session = Depends(get_db)):
     return SongDAO(db)
 
+
+# lecturas del catálogo: pueden ir a una réplica
+def get_song_read_dao(db: Session = Depends(get_read_db)) -> SongDAO:
+    return SongDAO(db)
+
+
+def get_async_song_dao(db: AsyncSession = Depends(get_async_db)) -> AsyncSongDAO:
+    return AsyncSongDAO(db)
@@ -1,35 +1,95 @@
 # app/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
-from app.db import engine, Base, SessionLocal
+from app import db_metrics
+from app.config import settings
+from app.dao.pagination import NEXT_CURSOR_HEADER
+from app.db import engine, async_engine, Base, SessionLocal, warm_up_pool, pin_to_primary
 import app.models  # <- pobla Base.metadata
+import app.services.search_index  # noqa: F401  (mantiene el índice de /buscar al hacer commit)
 from app.api.routes import api_router  # <- agregador /api
+from app.services import like_counter, play_counter, response_cache
+from app.services.rankings import ranking_refresher
+from app.services.trending import trending_rollup
 from app.services.seed import ensure_seed_genres
+from app.services.users_client import start_users_client, close_users_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Seed para crear los géneros
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        ensure_seed_genres(db)
+    if settings.db_pool_warmup:
+        warm_up_pool()
+    # cliente HTTP compartido hacia el servicio de usuarios
+    await start_users_client()
+    # puntuaciones de tendencia y rankings top/tendencia precalculados
+    # (primera pasada nada más arrancar)
+    trending_rollup.start()
+    ranking_refresher.start()
+    # volcado periódico de las reproducciones acumuladas en memoria
+    play_counter.play_counter_flusher.start()
+    # recálculo por lotes de numLikes
+    like_counter.like_counter_flusher.start()
+    yield
+    # lo que quede pendiente se escribe antes de cerrar las conexiones
+    await play_counter.drain()
+    await like_counter.drain()
+    await ranking_refresher.stop()
+    await trending_rollup.stop()
+    await close_users_client()
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Contenido API", lifespan=lifespan)
 
-app = FastAPI(title="Contenido API")
+# caché de respuestas de los GET del catálogo; va por dentro de las métricas SQL
+# (un acierto se ve como 0 queries) y se invalida en los commits
+@app.middleware("http")
+async def cache_catalogo(request: Request, call_next):
+    return await response_cache.handle(request, call_next)
 
-# CORS
+# read-your-writes: tras una escritura, el cliente lee del primario un rato
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    pin_to_primary(request, response)
+    return response
+
+# métricas SQL por petición: cabecera Server-Timing + log (y aviso de N+1 en desarrollo)
+@app.middleware("http")
+async def sql_metrics(request: Request, call_next):
+    if not settings.sql_metrics:
+        return await call_next(request)
+    with db_metrics.track_sql() as stats:
+        response = await call_next(request)
+    response.headers.append("Server-Timing", stats.server_timing())
+    if settings.sql_n1_detection:
+        repeated = stats.repeated()
+        if repeated:
+            response.headers["X-SQL-N1"] = str(max(n for _, n in repeated))
+    db_metrics.log_request(request.method, request.url.path, response.status_code, stats)
+    return response
+
+# CORS: se registra el último para que sea el middleware más externo (Starlette
+# envuelve en orden inverso) y también pase por él una respuesta de la caché
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    # el frontend necesita leer el cursor de paginación
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # estáticos
 app.mount("/files", StaticFiles(directory="app/static"), name="files")
 
-
-
-# Seed para crear los géneros
-@app.on_event("startup")
-def on_startup() -> None:
-    Base.metadata.create_all(bind=engine)
-    # seed géneros
-    with SessionLocal() as db:
-        ensure_seed_genres(db)
-
 # rutas
 app.include_router(api_router)  # <-- expone /api/canciones, etc.
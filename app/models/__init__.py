@@ -8,4 +8,9 @@ from .playlist import Playlist, PlaylistSong
 # from .rating import Rating
 
 from .genre import Genre
-from .purchase import CompraCancion
+from .purchase import CompraCancion, CompraAlbum
+from .comment import Comment
+from .ranking import CancionRanking
+from .search import BusquedaIndice
+from .trending import CancionReproduccionHora, CancionTendencia
+from .like import CancionLike, AlbumLike
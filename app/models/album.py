@@ -16,6 +16,8 @@ class Album(Base):
     imgPortada: Mapped[str | None] = mapped_column(String, nullable=True)
     date: Mapped[Date | None] = mapped_column(Date, nullable=True)
     precio: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    # lo mantiene la agregación periódica de app.services.like_counter
+    numLikes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     # relaciones con géneros
     genres = relationship("Genre", secondary=album_genero, back_populates="albums")
@@ -65,7 +67,13 @@ class Album(Base):
         # Para compatibilidad con el frontend que espera "genre"
         return self.generos
 
+    # ids precargados por el DAO (loaders.attach_child_ids); no es columna
+    _canciones_ids = None
+
     @property
     def canciones_ids(self) -> list[int]:
+        # si la relación está en memoria (p. ej. recién asignada) manda ella
+        if self._canciones_ids is not None and "canciones" not in self.__dict__:
+            return self._canciones_ids
         return [c.id for c in self.canciones]
 
@@ -1,5 +1,5 @@
 # app/models/associations.py
-from sqlalchemy import Table, Column, ForeignKey, UniqueConstraint
+from sqlalchemy import Table, Column, ForeignKey, UniqueConstraint, Index
 from app.db import Base
 
 
@@ -17,6 +17,8 @@ cancion_genero = Table(
     Column("cancion_id", ForeignKey("cancion.id", ondelete="CASCADE"), primary_key=True),
     Column("genre_id", ForeignKey("genre.id", ondelete="CASCADE"), primary_key=True),
     UniqueConstraint("cancion_id", "genre_id", name="uq_cancion_genero"),
+    # la PK empieza por cancion_id; el filtro por género entra por genre_id
+    Index("ix_cancion_genero_genre_cancion", "genre_id", "cancion_id"),
 )
 
 album_genero = Table(
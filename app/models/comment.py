@@ -7,6 +7,8 @@ from app.db import Base
 
 class Comment(Base):
     __tablename__ = "comentario"
+    # created_at (server_default) vuelve en el RETURNING del INSERT: no hace falta refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -0,0 +1,35 @@
+# app/models/like.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class CancionLike(Base):
+    """Un "me gusta" por (canción, usuario): la PK compuesta evita duplicados."""
+
+    __tablename__ = "cancion_like"
+
+    cancion_id: Mapped[int] = mapped_column(
+        ForeignKey("cancion.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_ref: Mapped[str] = mapped_column(String(120), primary_key=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class AlbumLike(Base):
+    __tablename__ = "album_like"
+
+    album_id: Mapped[int] = mapped_column(
+        ForeignKey("album.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_ref: Mapped[str] = mapped_column(String(120), primary_key=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -12,6 +12,8 @@ from app.db import Base
 
 class Playlist(Base):
     __tablename__ = "playlist"
+    # created_at/updated_at se leen en el RETURNING del INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -40,9 +42,15 @@ class Playlist(Base):
         order_by="PlaylistSong.position",
     )
 
+    # ids precargados por el DAO (loaders.attach_child_ids); no es columna
+    _song_ids = None
+
     # para que el schema pueda sacar song_ids directamente
     @property
     def song_ids(self) -> list[int]:
+        # si la relación está en memoria (p. ej. tras add_song) manda ella
+        if self._song_ids is not None and "songs" not in self.__dict__:
+            return self._song_ids
         return [ps.cancion_id for ps in self.songs]
 
 
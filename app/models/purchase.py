@@ -8,6 +8,8 @@ from app.db import Base
 
 class CompraCancion(Base):
     __tablename__ = "compra_cancion"
+    # purchased_at se lee en el RETURNING del INSERT
+    __mapper_args__ = {"eager_defaults": True}
 
     # PK compuesta (idempotencia: 1 fila por (cancion, usuario))
     cancion_id: Mapped[int] = mapped_column(
@@ -35,6 +37,7 @@ class CompraCancion(Base):
 
 class CompraAlbum(Base):
     __tablename__ = "compra_album"
+    __mapper_args__ = {"eager_defaults": True}
 
     album_id: Mapped[int] = mapped_column(
         ForeignKey("album.id", ondelete="CASCADE"),
@@ -0,0 +1,28 @@
+# app/models/ranking.py
+from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+# ordenaciones de /canciones?popularidad= que se sirven precalculadas
+RANKING_KINDS = ("top", "tendencia")
+# genre_id del ranking global (los ids reales de género empiezan en 1)
+GLOBAL_RANKING = 0
+
+
+class CancionRanking(Base):
+    """
+    Ranking precalculado de canciones (lo reconstruye app.services.rankings cada
+    RANKING_REFRESH_INTERVAL segundos). Así las lecturas no ordenan la tabla
+    `cancion`, que está caliente por /play.
+    """
+
+    __tablename__ = "cancion_ranking"
+
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    genre_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cancion_id: Mapped[int] = mapped_column(
+        ForeignKey("cancion.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False, default=0)
@@ -0,0 +1,32 @@
+# app/models/search.py
+from sqlalchemy import Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class BusquedaIndice(Base):
+    """
+    Índice de búsqueda del catálogo (/api/buscar): una fila por canción o álbum.
+    Lo mantiene app.services.search_index al hacer commit de cambios en
+    canciones/álbumes.
+    """
+
+    __tablename__ = "busqueda"
+
+    tipo: Mapped[str] = mapped_column(String(16), primary_key=True)  # "cancion" | "album"
+    ref_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # título tal cual, para mostrarlo en los resultados
+    titulo: Mapped[str] = mapped_column(String(255), nullable=False)
+    # título + géneros + emails de artistas, en minúsculas y sin tildes
+    texto: Mapped[str] = mapped_column(Text, nullable=False)
+    # solo Postgres: tsvector (título con peso A, resto con peso B);
+    # en SQLite queda a NULL y se busca con LIKE sobre `texto`
+    documento = mapped_column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True)
+
+    __table_args__ = (
+        Index("ix_busqueda_documento", "documento", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
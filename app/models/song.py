@@ -1,6 +1,6 @@
 # app/models/song.py
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Integer, String, Float, Date, ForeignKey, Index
 from app.db import Base
 from .associations import cancion_genero
 from .artist_links import CancionArtistaLink
@@ -12,6 +12,11 @@ from typing import List
 
 class Cancion(Base):
     __tablename__ = "cancion"
+    __table_args__ = (
+        # paginación por cursor de /canciones?popularidad=top (tendencia ordena
+        # por cancion_tendencia.score); se recorre hacia atrás para DESC, DESC
+        Index("ix_cancion_likes_id", "numLikes", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     nomCancion: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -0,0 +1,42 @@
+# app/models/trending.py
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class CancionReproduccionHora(Base):
+    """
+    Reproducciones por canción y hora (UTC, truncada a la hora). La escribe el
+    volcado del contador de /play con un upsert por lote; app.services.trending
+    la agrega en cancion_tendencia y borra las horas fuera de la ventana.
+    """
+
+    __tablename__ = "cancion_reproduccion_hora"
+    __table_args__ = (
+        # la agregación y la purga recorren por hora
+        Index("ix_cancion_reproduccion_hora_hora", "hora"),
+    )
+
+    cancion_id: Mapped[int] = mapped_column(
+        ForeignKey("cancion.id", ondelete="CASCADE"), primary_key=True
+    )
+    hora: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    reproducciones: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class CancionTendencia(Base):
+    """
+    Puntuación de tendencia de cada canción con reproducciones en la ventana:
+    suma de las reproducciones por hora con decaimiento exponencial según su
+    antigüedad. Es lo que ordena popularidad=tendencia.
+    """
+
+    __tablename__ = "cancion_tendencia"
+
+    cancion_id: Mapped[int] = mapped_column(
+        ForeignKey("cancion.id", ondelete="CASCADE"), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False, default=0)
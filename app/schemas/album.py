@@ -14,6 +14,7 @@ class AlbumOut(BaseModel):
     precio: float
     canciones_ids: List[int] = []
     artistas_emails: List[str] = []
+    numLikes: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,47 @@
+# app/schemas/fields.py
+# Sparse fieldsets: ?fields=id,nomCancion,imgPortada devuelve solo esos campos
+# del esquema de salida. Los DAOs cargan solo las columnas/relaciones
+# necesarias (app/dao/loaders.field_options) y aquí se proyecta cada objeto con
+# los serializadores del propio esquema (prefijo /files/, alias "genres"...).
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from pydantic import BaseModel
+
+
+class InvalidFields(ValueError):
+    """`fields` incluye nombres que no existen en el esquema de salida."""
+
+
+def parse_fields(raw: Optional[str], schema: type[BaseModel]) -> Optional[frozenset[str]]:
+    """
+    Nombres de campo del esquema pedidos en `raw` (separados por comas; vale el
+    nombre del campo o su alias JSON). None si no se pidió proyección.
+    """
+    if raw is None or not raw.strip():
+        return None
+    known: dict[str, str] = {}
+    for name, info in schema.model_fields.items():
+        known[name] = name
+        if info.serialization_alias:
+            known[info.serialization_alias] = name
+    requested = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = sorted({part for part in requested if part not in known})
+    if unknown:
+        raise InvalidFields(f"Campos no válidos: {', '.join(unknown)}")
+    # el id siempre va: es lo que el cliente usa para pedir el resto
+    return frozenset(known[part] for part in requested) | {"id"}
+
+
+def project(obj: Any, fields: frozenset[str], schema: type[BaseModel]) -> dict:
+    """
+    Serializa solo `fields` de `obj` con el esquema dado. Solo se leen esos
+    atributos, así que no se disparan cargas de columnas o relaciones omitidas.
+    """
+    data = {name: getattr(obj, name) for name in fields}
+    return schema.model_construct(**data).model_dump(mode="json", by_alias=True, include=set(fields))
+
+
+def project_many(objs: Iterable[Any], fields: frozenset[str], schema: type[BaseModel]) -> list[dict]:
+    return [project(obj, fields, schema) for obj in objs]
@@ -0,0 +1,14 @@
+# app/schemas/like.py
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class LikeCheckMultipleIn(BaseModel):
+    # mismo tope que una página del listado (MAX_LIMIT)
+    ids: List[int] = Field(..., min_length=1, max_length=200)
+
+
+class LikeCheckMultipleOut(BaseModel):
+    # de los ids pedidos, los que le gustan al usuario
+    liked: List[int]
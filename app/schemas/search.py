@@ -0,0 +1,13 @@
+# app/schemas/search.py
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class BusquedaOut(BaseModel):
+    tipo: Literal["cancion", "album"]
+    id: int
+    titulo: str
+    rank: float
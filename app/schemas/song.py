@@ -56,3 +56,16 @@ class CancionUpdate(BaseModel):
 class CancionPriceUpdate(BaseModel):
     """Schema específico para actualizar solo el precio de una canción."""
     precio: float
+
+
+class CancionBatchIn(BaseModel):
+    """Ids a consultar de una vez (p. ej. las de una playlist o un álbum)."""
+    # mismo tope que una página del listado (MAX_LIMIT)
+    ids: List[int] = Field(..., min_length=1, max_length=200)
+
+
+class CancionBatchOut(BaseModel):
+    # en el mismo orden que se pidieron (sin repetidas)
+    canciones: List[CancionOut]
+    # ids pedidos que no existen
+    faltantes: List[int] = Field(default_factory=list)
@@ -6,8 +6,7 @@ from sqlalchemy.orm import Session
 from app.dao.album_dao import AlbumDAO
 from app.models.album import Album
 from app.models.song import Cancion
-from app.models.genre import Genre
-from sqlalchemy import func
+from app.services.genre_registry import genre_registry
 
 class AlbumService:
     def __init__(self, db: Session):
@@ -19,14 +18,19 @@ class AlbumService:
         Servicio para actualizar un álbum, manejando la lógica de negocio
         para relaciones como géneros y canciones.
         """
-        album = self.album_dao.get(album_id)
-        if not album:
-            return None
-
         # Separar campos simples de relaciones
         simple_fields = {k: v for k, v in update_data.items() if k not in ["canciones_ids", "genre_names", "artista_emails"]}
-        if simple_fields:
-            self.album_dao.update(album_id, update_data=simple_fields)
+        if "canciones_ids" in update_data:
+            # reasignar album.canciones necesita la colección actual en memoria
+            album = self.album_dao.get_with_songs(album_id)
+            if album and simple_fields:
+                album = self.album_dao.update(album_id, update_data=simple_fields)
+        elif simple_fields:
+            album = self.album_dao.update(album_id, update_data=simple_fields)
+        else:
+            album = self.album_dao.get(album_id)
+        if not album:
+            return None
 
         # Lógica de negocio para relaciones
         if "canciones_ids" in update_data:
@@ -34,15 +38,13 @@ class AlbumService:
             album.canciones = canciones
 
         if "genre_names" in update_data:
-            norm = [g.strip().lower() for g in update_data["genre_names"] if g.strip()]
-            found = self.db.query(Genre).filter(func.lower(Genre.name).in_(norm)).all()
-            album.genres = found
+            album.genres = genre_registry.get_genres(self.db, update_data["genre_names"])
 
         if "artista_emails" in update_data:
             album.set_artistas_emails(update_data["artista_emails"])
 
-        self.db.commit()
-        self.db.refresh(album)
+        # una sola transacción: el commit lo hace get_db al final de la request
+        self.db.flush()
         return album
 
     def update_album_price(self, album_id: int, precio: float) -> Optional[Album]:
@@ -1,33 +1,116 @@
 # app/services/auth_proxy.py
-import os
+import asyncio
+
 import httpx
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app import config
+from app.services import jwt_verifier
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.identity_cache import identity_cache, token_key
+from app.services.users_client import get_users_client
 
 security = HTTPBearer(auto_error=False)
 
-async def get_current_identity(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-):
-    if credentials is None or not credentials.credentials:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Falta token Bearer")
+INVALID_TOKEN = "Token inválido"
 
-    token = credentials.credentials
-    url = f"{config.settings.users_base_url}/auth/me"
+# llamadas a /auth/me en curso, por hash de token
+_inflight: dict[str, asyncio.Future] = {}
+
+users_breaker = CircuitBreaker(
+    failure_threshold=config.settings.users_breaker_failure_threshold,
+    reset_timeout=config.settings.users_breaker_reset_timeout,
+)
+
+
+def _users_unavailable(token: str) -> dict:
+    """Servicio de usuarios caído: identidad reciente (si hay margen de gracia) o 503."""
+    stale = identity_cache.get_stale(token)
+    if stale is not None:
+        return stale
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servicio de usuarios no disponible",
+    )
+
+
+async def _call_auth_me(token: str) -> dict:
+    # breaker abierto: fallamos rápido sin esperar al timeout
+    if not users_breaker.allow_request():
+        return _users_unavailable(token)
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            r = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+        # cliente compartido (keep-alive) creado en el lifespan
+        client = get_users_client()
+        r = await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
     except httpx.RequestError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Servicio de usuarios no disponible",
-        )
+        users_breaker.record_failure()
+        return _users_unavailable(token)
+    except BaseException:
+        # cualquier otro error (cliente cerrado al apagar, tarea cancelada...)
+        # también cuenta: si no, una llamada de prueba en half-open nunca
+        # liberaría su hueco y el breaker rechazaría todo para siempre
+        users_breaker.record_failure()
+        raise
+
+    if r.status_code >= 500:
+        users_breaker.record_failure()
+        return _users_unavailable(token)
+    users_breaker.record_success()
 
     if r.status_code != 200:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
+        # token revocado/caducado: fuera de la caché
+        identity_cache.invalidate(token)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_TOKEN)
 
     # Devuelve { user_type: "user"|"artist", user_data: {...} }
-    return r.json()
+    identity = r.json()
+    identity_cache.set(token, identity)
+    return identity
+
+
+async def _fetch_remote_identity(token: str) -> dict:
+    """Valida el token contra {users_base_url}/auth/me (con caché y single-flight)."""
+    # 1) caché local (evita el round trip a /auth/me)
+    cached = identity_cache.get(token)
+    if cached is not None:
+        return cached
+
+    # 2) single-flight: peticiones concurrentes con el mismo token comparten
+    #    una única llamada a /auth/me
+    key = token_key(token)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_call_auth_me(token))
+        _inflight[key] = task
+
+        def _done(t: asyncio.Future, key: str = key) -> None:
+            if _inflight.get(key) is t:
+                del _inflight[key]
+
+        task.add_done_callback(_done)
+
+    # shield: si un cliente cancela, la llamada compartida sigue para los demás
+    return await asyncio.shield(task)
+
+
+async def get_current_identity(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    if credentials is None or not credentials.credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Falta token Bearer")
+
+    token = credentials.credentials
+    mode = config.settings.auth_mode
+
+    if mode in ("local", "hybrid"):
+        try:
+            return jwt_verifier.verify_token(token)
+        except jwt_verifier.InvalidToken:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_TOKEN)
+        except jwt_verifier.NoVerificationKey:
+            if mode == "local":
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_TOKEN)
+            # hybrid: no tenemos clave para este token -> /auth/me
 
+    return await _fetch_remote_identity(token)
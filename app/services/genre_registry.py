@@ -0,0 +1,108 @@
+# app/services/genre_registry.py
+# Registro en memoria de la tabla `genre` (pequeña y casi estática): resuelve
+# nombres -> géneros sin ir a BD. Se carga al arrancar (ensure_seed_genres) y se
+# invalida cuando un commit toca géneros; si llega un nombre desconocido se
+# recarga (como mucho cada _MISS_RELOAD_INTERVAL s) por si otro worker lo creó.
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.genre import Genre
+
+_MISS_RELOAD_INTERVAL = 30.0
+_CHANGED_KEY = "genres_changed"
+
+
+class GenreRegistry:
+    def __init__(self):
+        # nombre en minúsculas -> (id, nombre tal cual)
+        self._by_name: Optional[dict[str, tuple[int, str]]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> dict[str, tuple[int, str]]:
+        """Relee la tabla y devuelve las entradas cargadas."""
+        rows = db.query(Genre.id, Genre.name).all()
+        by_name = {name.lower(): (genre_id, name) for genre_id, name in rows}
+        with self._lock:
+            self._by_name = by_name
+            self._loaded_at = time.monotonic()
+        # se devuelve lo construido: otro hilo puede invalidar _by_name ya mismo
+        return by_name
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._by_name = None
+
+    def _entries(self, db: Session) -> dict[str, tuple[int, str]]:
+        by_name = self._by_name
+        if by_name is None:
+            by_name = self.load(db)
+        return by_name
+
+    def names(self, db: Session) -> list[str]:
+        return sorted(name for _, name in self._entries(db).values())
+
+    def lookup(self, db: Session, names: Iterable[str]) -> dict[str, tuple[int, str]]:
+        """nombre normalizado -> (id, nombre) de los que existen (sin mayúsculas ni espacios)."""
+        wanted = {n.strip().lower() for n in names if n and n.strip()}
+        entries = self._entries(db)
+        if not wanted <= entries.keys() and time.monotonic() - self._loaded_at > _MISS_RELOAD_INTERVAL:
+            entries = self.load(db)
+        return {n: entries[n] for n in wanted if n in entries}
+
+    def get_genres(self, db: Session, names: Iterable[str]) -> list[Genre]:
+        """Géneros existentes de esos nombres, asociados a la sesión sin hacer SELECT."""
+        genres = []
+        for genre_id, name in self.lookup(db, names).values():
+            genre = Genre(id=genre_id, name=name)
+            make_transient_to_detached(genre)
+            genres.append(db.merge(genre, load=False))
+        return genres
+
+    def ids_matching(self, db: Session, genero: str) -> list[int]:
+        """Id del género de nombre exacto si existe; si no, los que empiezan por `genero`."""
+        name = genero.strip().lower()
+        entries = self._entries(db)
+        if name in entries:
+            return [entries[name][0]]
+        return [genre_id for key, (genre_id, _) in entries.items() if key.startswith(name)]
+
+
+genre_registry = GenreRegistry()
+
+
+def changed_genres(session: Session) -> bool:
+    """
+    ¿El flush crea, borra o cambia columnas de algún género? Asociar un género
+    a una canción o álbum solo toca su colección inversa (Genre.songs/albums)
+    y lo deja en session.dirty, pero eso no cambia la tabla `genre`.
+    """
+    if any(isinstance(o, Genre) for o in (*session.new, *session.deleted)):
+        return True
+    return any(
+        isinstance(o, Genre) and session.is_modified(o, include_collections=False)
+        for o in session.dirty
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _note_genre_changes(session: Session, flush_context) -> None:
+    if changed_genres(session):
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        genre_registry.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
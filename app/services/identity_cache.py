@@ -0,0 +1,142 @@
+# app/services/identity_cache.py
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+
+def token_key(token: str) -> str:
+    """Clave de caché: nunca guardamos el token en claro, solo su hash."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """
+    Lee el claim `exp` de un JWT SIN verificar la firma (solo para acotar la caché).
+    Si el token no es un JWT o no trae `exp`, devuelve None.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1]
+    payload += "=" * (-len(payload) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class IdentityCache:
+    """
+    Caché LRU con TTL de identidades devueltas por /auth/me.
+    La entrada de un token nunca sobrevive a la expiración (`exp`) del propio token.
+
+    Tras el TTL la entrada se conserva `stale_grace` segundos más: no se sirve
+    normalmente, solo vía `get_stale` cuando el servicio de usuarios no responde.
+    """
+
+    def __init__(self, *, ttl: float, max_size: int, stale_grace: float = 0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stale_grace = stale_grace
+        # clave -> (fresco_hasta, utilizable_hasta, identidad)
+        self._data: "OrderedDict[str, tuple[float, float, dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, token: str) -> Optional[dict[str, Any]]:
+        if not self.enabled:
+            return None
+        key = token_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            fresh_until, usable_until, identity = entry
+            if fresh_until <= now:
+                if usable_until <= now:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return identity
+
+    def get_stale(self, token: str) -> Optional[dict[str, Any]]:
+        """Identidad validada recientemente, aunque haya pasado el TTL (dentro del margen de gracia)."""
+        if not self.enabled:
+            return None
+        key = token_key(token)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            self.stale_hits += 1
+            return entry[2]
+
+    def set(self, token: str, identity: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        fresh_until = now + self.ttl
+        usable_until = fresh_until + self.stale_grace
+        exp = token_expiry(token)
+        if exp is not None:
+            fresh_until = min(fresh_until, exp)
+            usable_until = min(usable_until, exp)
+        if fresh_until <= now:
+            return
+        key = token_key(token)
+        with self._lock:
+            self._data[key] = (fresh_until, usable_until, identity)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            self._data.pop(token_key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_grace": self.stale_grace,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+identity_cache = IdentityCache(
+    ttl=settings.identity_cache_ttl,
+    max_size=settings.identity_cache_max_size,
+    stale_grace=settings.identity_stale_grace,
+)
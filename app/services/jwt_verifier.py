@@ -0,0 +1,90 @@
+# app/services/jwt_verifier.py
+# Verificación local (offline) de los JWT emitidos por el microservicio de usuarios.
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional
+
+import jwt
+
+from app import config
+
+# claims estándar que no forman parte de user_data
+_REGISTERED_CLAIMS = {"exp", "iat", "nbf", "iss", "aud", "jti", "sub", "typ"}
+
+
+class NoVerificationKey(Exception):
+    """No hay clave local con la que verificar el token (en modo hybrid se usa /auth/me)."""
+
+
+class InvalidToken(Exception):
+    """Firma, expiración o claims del token no válidos."""
+
+
+@lru_cache(maxsize=4)
+def _load_public_key(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=4)
+def _load_jwks(path: str) -> jwt.PyJWKSet:
+    with open(path, "r", encoding="utf-8") as f:
+        return jwt.PyJWKSet.from_json(f.read())
+
+
+def _resolve_key(token: str) -> Any:
+    s = config.settings
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.DecodeError:
+        # no es un JWT (token opaco): solo lo puede validar /auth/me
+        raise NoVerificationKey("El token no es un JWT")
+    if s.jwt_jwks_file:
+        kid = header.get("kid")
+        jwks = _load_jwks(s.jwt_jwks_file)
+        for jwk in jwks.keys:
+            if kid is None or jwk.key_id == kid:
+                return jwk.key
+        raise NoVerificationKey(f"kid desconocido: {kid}")
+    if s.jwt_public_key_file:
+        return _load_public_key(s.jwt_public_key_file)
+    raise NoVerificationKey("No hay JWT_PUBLIC_KEY_FILE ni JWT_JWKS_FILE configurado")
+
+
+def identity_from_claims(claims: dict[str, Any]) -> dict[str, Any]:
+    """Construye el mismo { user_type, user_data } que devuelve /auth/me."""
+    s = config.settings
+    user_type = claims.get(s.jwt_user_type_claim) or "user"
+    user_data = claims.get("user_data")
+    if not isinstance(user_data, dict):
+        user_data = {
+            k: v
+            for k, v in claims.items()
+            if k not in _REGISTERED_CLAIMS and k != s.jwt_user_type_claim
+        }
+    if not user_data.get("email") and claims.get("sub"):
+        user_data["email"] = claims["sub"]
+    return {"user_type": user_type, "user_data": user_data}
+
+
+def verify_token(token: str) -> dict[str, Any]:
+    """Valida firma y expiración del token y devuelve la identidad."""
+    s = config.settings
+    key = _resolve_key(token)
+    options: dict[str, Any] = {"require": ["exp"]}
+    audience: Optional[str] = s.jwt_audience or None
+    if audience is None:
+        options["verify_aud"] = False
+    try:
+        claims = jwt.decode(
+            token,
+            key=key,
+            algorithms=s.jwt_algorithms,
+            audience=audience,
+            issuer=s.jwt_issuer or None,
+            options=options,
+        )
+    except jwt.PyJWTError as e:
+        raise InvalidToken(str(e))
+    return identity_from_claims(claims)
@@ -0,0 +1,104 @@
+# app/services/like_counter.py
+# Agregación por lotes de numLikes. Las rutas de like/unlike solo escriben en
+# cancion_like/album_like y anotan el id en la sesión (LikeDAO); tras el commit
+# esos ids pasan a un conjunto pendiente del worker y una tarea periódica
+# recalcula numLikes de todos ellos con un UPDATE por tipo. Como se recalcula
+# el total (COUNT) y no se suma, reintentar o solaparse con otro worker es
+# inofensivo; si un worker muere con ids pendientes, el siguiente like de esa
+# canción/álbum vuelve a cuadrar el contador.
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.dao.like_dao import LIKES_CHANGED_KEY, LikeDAO
+from app.db import SessionLocal
+from app.services import response_cache
+from app.services.periodic import PeriodicTask
+
+# etiquetas de la caché de respuestas que dependen de numLikes
+_CACHE_TAGS = {
+    "cancion": lambda i: {"canciones", f"cancion:{i}"},
+    "album": lambda i: {"albumes", f"album:{i}"},
+}
+
+
+class LikeCounter:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._pending: dict[str, set[int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.updated = 0
+        self.flushes = 0
+
+    def mark(self, changed: dict[str, set[int]]) -> None:
+        with self._lock:
+            for kind, ids in changed.items():
+                self._pending.setdefault(kind, set()).update(ids)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(ids) for ids in self._pending.values())
+
+    def _take(self) -> dict[str, set[int]]:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            return batch
+
+    def flush(self) -> int:
+        """Recalcula numLikes de lo pendiente en una transacción. Devuelve el nº de filas."""
+        with self._flush_lock:
+            batch = self._take()
+            if not batch:
+                return 0
+            try:
+                with self.session_factory() as db:
+                    dao = LikeDAO(db)
+                    rows = sum(dao.recompute_counts(kind, ids) for kind, ids in batch.items())
+                    db.commit()
+            except Exception:
+                self.mark(batch)
+                raise
+            tags: set[str] = set()
+            for kind, ids in batch.items():
+                for target_id in ids:
+                    tags |= _CACHE_TAGS[kind](target_id)
+            response_cache.backend.invalidate_tags(tags)
+            self.updated += rows
+            self.flushes += 1
+            return rows
+
+    def stats(self) -> dict[str, Any]:
+        return {"pending": self.pending(), "updated": self.updated, "flushes": self.flushes}
+
+
+like_counter = LikeCounter()
+like_counter_flusher = PeriodicTask(
+    "like_counter", settings.like_counter_flush_interval, like_counter.flush
+)
+
+
+async def drain() -> None:
+    """Para la tarea periódica y recalcula lo pendiente (apagado del worker)."""
+    await like_counter_flusher.stop()
+    await like_counter_flusher.run_once()
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed(session: Session) -> None:
+    changed = session.info.pop(LIKES_CHANGED_KEY, None)
+    if not changed:
+        return
+    like_counter.mark(changed)
+    if settings.like_counter_flush_interval <= 0:
+        like_counter.flush()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(LIKES_CHANGED_KEY, None)
@@ -0,0 +1,90 @@
+# app/services/periodic.py
+# Tareas periódicas en segundo plano dentro del proceso (una por worker):
+# se arrancan en el lifespan y se paran al apagar. La función es síncrona
+# (usa sesiones de BD normales) y se ejecuta en el threadpool para no
+# bloquear el event loop. Las que reconstruyen una tabla entera toman antes
+# try_job_lock para que solo un worker lo haga en cada pasada.
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from typing import Any, Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+def try_job_lock(db: Session, name: str) -> bool:
+    """
+    Cerrojo de la tarea `name` entre workers para la transacción en curso
+    (pg_try_advisory_xact_lock, se suelta en el commit/rollback). False si lo
+    tiene otro worker: esa pasada se salta. Fuera de PostgreSQL siempre True.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    key = zlib.crc32(name.encode())
+    return bool(db.execute(select(func.pg_try_advisory_xact_lock(key))).scalar())
+
+
+class PeriodicTask:
+    def __init__(self, name: str, interval: float, fn: Callable[[], Any]):
+        self.name = name
+        self.interval = interval  # segundos; <= 0 desactiva la tarea
+        self.fn = fn
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_result: Any = None
+
+    async def run_once(self) -> Any:
+        t0 = time.perf_counter()
+        try:
+            result = await run_in_threadpool(self.fn)
+        except Exception:
+            self.failures += 1
+            logger.exception("Fallo en la tarea periódica %s", self.name)
+            return None
+        finally:
+            self.runs += 1
+            self.last_run = time.time()
+            self.last_duration = time.perf_counter() - t0
+        self.last_result = result
+        return result
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop(), name=f"periodic:{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "running": self._task is not None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_duration_ms": round(self.last_duration * 1000, 3) if self.last_duration is not None else None,
+            "last_result": self.last_result,
+        }
@@ -0,0 +1,103 @@
+# app/services/play_counter.py
+# Contador de reproducciones con escritura diferida (write-behind). POST
+# /canciones/{id}/play solo suma en memoria; una tarea periódica vuelca lo
+# acumulado a `cancion.numVisualizaciones` con un UPDATE por lotes (y a las
+# franjas horarias de cancion_reproduccion_hora, de las que sale la tendencia),
+# así que las canciones virales no hacen cola sobre el bloqueo de su fila. Cada worker
+# lleva su propio contador (los UPDATE son sumas, no se pisan entre sí) y al
+# apagar se vuelca lo pendiente. Si el volcado falla, lo tomado se devuelve al
+# contador y se reintenta en la siguiente pasada.
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Any, Callable, Mapping
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.dao.song_dao import SongDAO
+from app.db import SessionLocal
+from app.services.periodic import PeriodicTask
+from app.services.trending import current_hour
+
+
+class PlayCounter:
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._pending: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        # serializa los volcados de este proceso (tarea periódica, apagado,
+        # modo síncrono) para que el orden take -> commit/restore sea único
+        self._flush_lock = threading.Lock()
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+
+    def record(self, song_id: int, amount: int = 1) -> None:
+        with self._lock:
+            self._pending[song_id] += amount
+            self.recorded += amount
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(self._pending.values())
+
+    def _take(self) -> Counter[int]:
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+            return batch
+
+    def _restore(self, batch: Mapping[int, int]) -> None:
+        with self._lock:
+            self._pending.update(batch)
+
+    def flush(self) -> int:
+        """Vuelca lo acumulado en una transacción. Devuelve el nº de reproducciones."""
+        with self._flush_lock:
+            batch = self._take()
+            if not batch:
+                return 0
+            # las reproducciones van a la hora del volcado (como mucho unos
+            # segundos después de producirse)
+            hora = current_hour()
+            try:
+                with self.session_factory() as db:
+                    dao = SongDAO(db)
+                    dao.add_views(batch)
+                    dao.add_play_buckets(batch, hora)
+                    db.commit()
+            except Exception:
+                self._restore(batch)
+                raise
+            plays = sum(batch.values())
+            self.flushed += plays
+            self.flushes += 1
+            return plays
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": self.pending(),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+        }
+
+
+play_counter = PlayCounter()
+play_counter_flusher = PeriodicTask(
+    "play_counter", settings.play_counter_flush_interval, play_counter.flush
+)
+
+
+def record_play(song_id: int) -> None:
+    """Anota una reproducción; sin intervalo de volcado se escribe en el momento."""
+    play_counter.record(song_id)
+    if settings.play_counter_flush_interval <= 0:
+        play_counter.flush()
+
+
+async def drain() -> None:
+    """Para la tarea periódica y vuelca lo pendiente (apagado del worker)."""
+    await play_counter_flusher.stop()
+    await play_counter_flusher.run_once()
@@ -0,0 +1,86 @@
+# app/services/rankings.py
+# Reconstrucción periódica de `cancion_ranking` (global y por género) para
+# popularidad=top|tendencia. tendencia ordena por las puntuaciones con
+# decaimiento que mantiene app.services.trending.
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Float, cast, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.associations import cancion_genero
+from app.models.ranking import GLOBAL_RANKING, CancionRanking
+from app.models.song import Cancion
+from app.models.trending import CancionTendencia
+from app.services.periodic import PeriodicTask, try_job_lock
+
+# tipo de ranking -> métrica por la que se ordena (el id desempata, como en vivo)
+RANKING_SCORES = {
+    "top": Cancion.numLikes,
+    # puntuación con decaimiento de app.services.trending (0 sin reproducciones recientes)
+    "tendencia": func.coalesce(CancionTendencia.score, 0.0),
+}
+# tablas que hay que unir para tener la métrica
+_SCORE_JOINS = {
+    "tendencia": (CancionTendencia, CancionTendencia.cancion_id == Cancion.id),
+}
+
+_COLUMNS = ["kind", "genre_id", "rank", "cancion_id", "score"]
+
+
+def _ranking_select(kind: str, score, *, per_genre: bool):
+    order = (score.desc(), Cancion.id.desc())
+    if per_genre:
+        stmt = select(
+            literal(kind),
+            cancion_genero.c.genre_id,
+            func.row_number().over(partition_by=cancion_genero.c.genre_id, order_by=order),
+            Cancion.id,
+            cast(score, Float),
+        ).join_from(Cancion, cancion_genero, cancion_genero.c.cancion_id == Cancion.id)
+    else:
+        stmt = select(
+            literal(kind),
+            literal(GLOBAL_RANKING),
+            func.row_number().over(order_by=order),
+            Cancion.id,
+            cast(score, Float),
+        ).select_from(Cancion)
+    if kind in _SCORE_JOINS:
+        stmt = stmt.outerjoin(*_SCORE_JOINS[kind])
+    return stmt
+
+
+def refresh_rankings(db: Session) -> Optional[int]:
+    """
+    Recalcula todos los rankings en una única transacción: los lectores siguen
+    viendo el ranking anterior hasta el commit. Devuelve el nº de filas, o None
+    si otro worker lo está recalculando (con READ COMMITTED su DELETE no vería
+    las filas recién insertadas por el otro y el INSERT chocaría con la PK).
+    """
+    if not try_job_lock(db, "rankings"):
+        db.rollback()
+        return None
+    db.execute(delete(CancionRanking))
+    rows = 0
+    for kind, score in RANKING_SCORES.items():
+        for per_genre in (False, True):
+            result = db.execute(
+                insert(CancionRanking).from_select(
+                    _COLUMNS, _ranking_select(kind, score, per_genre=per_genre)
+                )
+            )
+            rows += max(result.rowcount, 0)
+    db.commit()
+    return rows
+
+
+def _refresh_job() -> Optional[int]:
+    with SessionLocal() as db:
+        return refresh_rankings(db)
+
+
+ranking_refresher = PeriodicTask("rankings", settings.ranking_refresh_interval, _refresh_job)
@@ -0,0 +1,286 @@
+# app/services/response_cache.py
+# Caché de respuestas HTTP para los GET del catálogo. La clave es ruta +
+# parámetros de query ordenados; cada respuesta lleva etiquetas
+# ("cancion:12", "albumes", ...) y los commits que tocan canciones, álbumes o
+# géneros invalidan las etiquetas afectadas (eventos de la sesión, igual que el
+# índice de búsqueda), así que cualquier ruta de escritura queda cubierta.
+#
+# Los clientes con la cookie de read-your-writes (app.db) no pasan por la caché.
+# Lo que se guarda se lee siempre del primario, aunque haya réplicas: la
+# invalidación ocurre en el commit del primario y una réplica con retraso
+# volvería a llenar la caché con datos viejos hasta el TTL. Solo los fallos de
+# caché van al primario; los aciertos no tocan la BD.
+#
+# El backend en memoria es por proceso: con varios workers cada uno invalida
+# solo lo suyo y el resto de copias caducan por TTL. Para compartir caché e
+# invalidaciones entre workers, RESPONSE_CACHE_BACKEND="paquete.modulo:Clase"
+# con una implementación de CacheBackend (Redis, memcached...).
+from __future__ import annotations
+
+import importlib
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from app.config import settings
+from app.db import _pinned_to_primary
+from app.models.album import Album
+from app.models.genre import Genre
+from app.models.song import Cancion
+
+# cabeceras que no se guardan: las calcula cada petición (o dependen del cliente)
+_EXCLUDED_HEADERS = {"content-length", "server-timing", "set-cookie", "x-sql-n1", "x-cache", "vary"}
+# las de CORS dependen del Origin de cada petición (las pone CORSMiddleware)
+_EXCLUDED_PREFIXES = ("access-control-",)
+_TAGS_KEY = "response_cache_tags"
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class CacheBackend(ABC):
+    """Interfaz de almacenamiento de la caché de respuestas."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: CachedResponse, *, ttl: float, tags: Iterable[str], epoch: int) -> None:
+        """Guarda la respuesta salvo que haya habido invalidaciones desde `epoch`."""
+
+    @abstractmethod
+    def epoch(self) -> int:
+        """Contador que avanza con cada invalidación (se lee antes de calcular la respuesta)."""
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict[str, Any]: ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """LRU con TTL y un índice etiqueta -> claves para invalidar sin recorrerlo todo."""
+
+    def __init__(self, *, max_entries: int):
+        self.max_entries = max_entries
+        # clave -> (caduca_en, etiquetas, respuesta)
+        self._data: "OrderedDict[str, tuple[float, frozenset[str], CachedResponse]]" = OrderedDict()
+        self._by_tag: dict[str, set[str]] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, value: CachedResponse, *, ttl: float, tags: Iterable[str], epoch: int) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            if epoch != self._epoch:
+                # hubo un commit mientras se calculaba: la respuesta puede ser vieja
+                return
+            self._drop(key)
+            self._data[key] = (time.monotonic() + ttl, tags, value)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._epoch += 1
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+            self._by_tag.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+def _build_backend() -> CacheBackend:
+    name = settings.response_cache_backend
+    if name == "memory":
+        return InMemoryCacheBackend(max_entries=settings.response_cache_max_entries)
+    module_name, _, class_name = name.partition(":")
+    backend_cls = getattr(importlib.import_module(module_name), class_name)
+    return backend_cls()
+
+
+backend: CacheBackend = _build_backend()
+
+
+# --- qué se cachea --------------------------------------------------------
+
+# (ruta, TTL, etiquetas de la respuesta a partir del match)
+_POLICIES: list[tuple[re.Pattern, Callable[[], float], Callable[[re.Match], set[str]]]] = [
+    (re.compile(r"^/api/canciones$"), lambda: settings.response_cache_ttl_list, lambda m: {"canciones"}),
+    (re.compile(r"^/api/canciones/(\d+)$"), lambda: settings.response_cache_ttl_detail, lambda m: {f"cancion:{m[1]}"}),
+    (re.compile(r"^/api/albumes$"), lambda: settings.response_cache_ttl_list, lambda m: {"albumes"}),
+    (re.compile(r"^/api/albumes/(\d+)$"), lambda: settings.response_cache_ttl_detail, lambda m: {f"album:{m[1]}"}),
+    (re.compile(r"^/api/generos$"), lambda: settings.response_cache_ttl_genres, lambda m: {"generos"}),
+]
+
+
+def _policy(request: Request) -> Optional[tuple[float, set[str]]]:
+    if request.method != "GET":
+        return None
+    for pattern, ttl, tags in _POLICIES:
+        m = pattern.match(request.url.path)
+        if m:
+            return ttl(), tags(m)
+    return None
+
+
+def cache_key(request: Request) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+async def handle(request: Request, call_next) -> Response:
+    """Cuerpo del middleware: sirve de la caché o guarda la respuesta calculada."""
+    policy = _policy(request) if settings.response_cache_enabled else None
+    # un cliente que acaba de escribir lee del primario (read-your-writes): ni se
+    # le sirve una copia que pudo salir de una réplica antes de su escritura, ni
+    # se guarda su respuesta
+    if policy is None or _pinned_to_primary(request):
+        return await call_next(request)
+
+    key = cache_key(request)
+    cached = backend.get(key)
+    if cached is not None:
+        response = Response(content=cached.body, status_code=cached.status_code)
+        response.headers.update(dict(cached.headers))
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    epoch = backend.epoch()
+    # lo que se guarda sale del primario (ver cabecera del módulo)
+    request.state.db_primary_read = True
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = [
+        (k, v)
+        for k, v in response.headers.items()
+        if k.lower() not in _EXCLUDED_HEADERS and not k.lower().startswith(_EXCLUDED_PREFIXES)
+    ]
+    ttl, tags = policy
+    backend.set(key, CachedResponse(response.status_code, headers, body), ttl=ttl, tags=tags, epoch=epoch)
+
+    fresh = Response(content=body, status_code=response.status_code, background=response.background)
+    for k, v in response.headers.items():
+        if k.lower() != "content-length":
+            fresh.headers.append(k, v)
+    fresh.headers["X-Cache"] = "MISS"
+    return fresh
+
+
+# --- invalidación al hacer commit ------------------------------------------
+
+def _history_values(obj, attr: str) -> set:
+    state = inspect(obj)
+    added, unchanged, deleted = state.attrs[attr].history
+    return {v for v in (*added, *unchanged, *deleted, getattr(obj, attr, None)) if v is not None}
+
+
+def _tags_for(session: Session, obj) -> set[str]:
+    if isinstance(obj, Cancion):
+        tags = {"canciones", f"cancion:{obj.id}"}
+        # el álbum (actual y anterior) expone canciones_ids
+        for album_id in _history_values(obj, "idAlbum"):
+            tags |= {"albumes", f"album:{album_id}"}
+        return tags
+    if isinstance(obj, Album):
+        return {"albumes", f"album:{obj.id}"}
+    if isinstance(obj, Genre):
+        # asociar un género a una canción/álbum solo toca su colección inversa
+        # (Genre.songs/albums): eso no cambia /generos
+        if obj in session.new or obj in session.deleted or session.is_modified(obj, include_collections=False):
+            return {"generos"}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session: Session, flush_context) -> None:
+    tags: set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tags |= _tags_for(session, obj)
+    if tags:
+        session.info.setdefault(_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tags = session.info.pop(_TAGS_KEY, None)
+    if tags:
+        backend.invalidate_tags(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tags(session: Session) -> None:
+    session.info.pop(_TAGS_KEY, None)
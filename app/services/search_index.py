@@ -0,0 +1,144 @@
+# app/services/search_index.py
+# Mantenimiento del índice de búsqueda (`busqueda`). Escuchamos los flush de
+# la sesión para anotar qué canciones/álbumes han cambiado y, justo antes del
+# commit, reindexamos esas filas dentro de la misma transacción: el índice
+# nunca queda por detrás de lo confirmado, sin tocar cada DAO/ruta de escritura.
+from __future__ import annotations
+
+import unicodedata
+from typing import Iterable
+
+from sqlalchemy import cast, delete, event, func, insert, inspect, literal, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.models.album import Album
+from app.models.search import BusquedaIndice
+from app.models.song import Cancion
+
+_MODELS = {"cancion": Cancion, "album": Album}
+# atributos que alimentan el índice: cambiar el precio no reindexa
+_INDEXED_ATTRS = {
+    "cancion": ("nomCancion", "genres", "artistas_refs"),
+    "album": ("titulo", "genres", "artistas_refs"),
+}
+_DIRTY_KEY = "search_dirty"
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin tildes y con los espacios colapsados."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+
+def _title(obj) -> str:
+    return obj.nomCancion if isinstance(obj, Cancion) else obj.titulo
+
+
+def _row(tipo: str, obj) -> dict:
+    titulo = _title(obj) or ""
+    texto = normalize(" ".join([titulo, *obj.generos, *obj.artistas_emails]))
+    return {"tipo": tipo, "ref_id": obj.id, "titulo": titulo[:255], "texto": texto}
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def reindex(db: Session, tipo: str, ids: Iterable[int]) -> None:
+    """Rehace las filas del índice de esas canciones/álbumes (borra las que ya no existen)."""
+    ids = sorted(set(ids))
+    if not ids:
+        return
+    model = _MODELS[tipo]
+    objs = (
+        db.query(model)
+        .options(selectinload(model.genres), selectinload(model.artistas_refs))
+        .filter(model.id.in_(ids))
+        .all()
+    )
+    db.execute(
+        delete(BusquedaIndice).where(
+            BusquedaIndice.tipo == tipo, BusquedaIndice.ref_id.in_(ids)
+        )
+    )
+    if not objs:
+        return
+    db.execute(insert(BusquedaIndice), [_row(tipo, o) for o in objs])
+    if _is_postgres(db):
+        cfg = cast(literal(settings.search_ts_config), REGCONFIG)
+        db.execute(
+            update(BusquedaIndice)
+            .where(BusquedaIndice.tipo == tipo, BusquedaIndice.ref_id.in_([o.id for o in objs]))
+            .values(
+                documento=func.setweight(func.to_tsvector(cfg, BusquedaIndice.titulo), "A").op("||")(
+                    func.setweight(func.to_tsvector(cfg, BusquedaIndice.texto), "B")
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_all(db: Session, batch_size: int = 500) -> int:
+    """Reindexa todo el catálogo (alta inicial del índice). Devuelve el nº de filas."""
+    total = 0
+    for tipo, model in _MODELS.items():
+        last_id = 0
+        while True:
+            ids = [
+                i
+                for (i,) in db.query(model.id)
+                .filter(model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+            reindex(db, tipo, ids)
+            total += len(ids)
+            last_id = ids[-1]
+    return total
+
+
+def _indexed_change(tipo: str, obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _INDEXED_ATTRS[tipo])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty(session: Session, flush_context) -> None:
+    # en after_flush las colecciones new/dirty/deleted y el historial de
+    # atributos aún reflejan lo que se acaba de escribir
+    for tipo, model in _MODELS.items():
+        ids = {
+            obj.id
+            for obj in (*session.new, *session.deleted)
+            if isinstance(obj, model)
+        }
+        ids.update(
+            obj.id
+            for obj in session.dirty
+            if isinstance(obj, model) and _indexed_change(tipo, obj)
+        )
+        ids.discard(None)
+        if ids:
+            session.info.setdefault(_DIRTY_KEY, {}).setdefault(tipo, set()).update(ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _reindex_dirty(session: Session) -> None:
+    # before_commit llega antes del último flush: lo forzamos para no perder cambios
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if not dirty:
+        return
+    for tipo, ids in dirty.items():
+        reindex(session, tipo, ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dirty(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
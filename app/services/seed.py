@@ -2,6 +2,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models.genre import Genre
+from app.services.genre_registry import genre_registry
 
 DEFAULT_GENRES = ["rock", "pop", "reggaeton", "hip hop", "electronic", "jazz", "classical"]
 
@@ -13,4 +14,6 @@ def ensure_seed_genres(db: Session) -> None:
     if to_add:
         db.add_all(to_add)
         db.commit()
+    # registro en memoria de géneros (lo usan los DAOs y /generos)
+    genre_registry.load(db)
 
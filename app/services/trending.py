@@ -0,0 +1,74 @@
+# app/services/trending.py
+# Rollup periódico de la tendencia: agrega las reproducciones por hora de
+# `cancion_reproduccion_hora` en `cancion_tendencia`, pesando cada franja con
+# decaimiento exponencial (una reproducción de hace TRENDING_HALF_LIFE_HOURS
+# horas vale la mitad que una de ahora), y purga las franjas que ya han salido
+# de la ventana. El ranking "tendencia" (global y por género) se calcula sobre
+# estas puntuaciones, así que ninguna lectura recorre los eventos crudos.
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models.trending import CancionReproduccionHora, CancionTendencia
+from app.services.periodic import PeriodicTask, try_job_lock
+
+
+def current_hour(now: Optional[datetime] = None) -> datetime:
+    """Inicio de la franja horaria (UTC, sin tzinfo, como se guarda)."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+def bucket_weights(now: datetime) -> dict[datetime, float]:
+    """Peso de cada franja de la ventana según su antigüedad respecto a `now`."""
+    start = current_hour(now)
+    half_life = settings.trending_half_life_hours
+    weights = {}
+    for hours_ago in range(settings.trending_window_hours):
+        hora = start - timedelta(hours=hours_ago)
+        age = (now - hora).total_seconds() / 3600
+        weights[hora] = 0.5 ** (age / half_life)
+    return weights
+
+
+def rollup_trending(db: Session, now: Optional[datetime] = None) -> Optional[int]:
+    """
+    Recalcula cancion_tendencia en una transacción (los lectores ven la
+    anterior hasta el commit). Devuelve el nº de canciones con puntuación, o
+    None si otro worker está haciendo el mismo rollup (ver refresh_rankings).
+    """
+    if not try_job_lock(db, "tendencias"):
+        db.rollback()
+        return None
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    weights = bucket_weights(now)
+    oldest = min(weights)
+    bucket = CancionReproduccionHora
+
+    db.execute(delete(bucket).where(bucket.hora < oldest))
+    db.execute(delete(CancionTendencia))
+    weight = case(weights, value=bucket.hora, else_=0.0)
+    result = db.execute(
+        insert(CancionTendencia).from_select(
+            ["cancion_id", "score"],
+            select(bucket.cancion_id, func.sum(bucket.reproducciones * weight))
+            .where(bucket.hora >= oldest)
+            .group_by(bucket.cancion_id),
+        )
+    )
+    db.commit()
+    return max(result.rowcount, 0)
+
+
+def _rollup_job() -> Optional[int]:
+    with SessionLocal() as db:
+        return rollup_trending(db)
+
+
+trending_rollup = PeriodicTask("tendencias", settings.trending_rollup_interval, _rollup_job)
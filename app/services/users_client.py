@@ -0,0 +1,96 @@
+# app/services/users_client.py
+# Cliente HTTP compartido (pool keep-alive) hacia el microservicio de usuarios.
+# Se crea en el lifespan de FastAPI y se cierra al apagar.
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import Any, Optional
+
+import httpx
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_http2_active = False
+
+
+def _build_client() -> httpx.AsyncClient:
+    global _http2_active
+    s = config.settings
+    http2 = s.users_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        # HTTP/2 es opcional: requiere `pip install httpx[http2]`
+        logger.warning("USERS_HTTP2 activo pero el paquete 'h2' no está instalado; se usa HTTP/1.1")
+        http2 = False
+    _http2_active = http2
+
+    return httpx.AsyncClient(
+        base_url=s.users_base_url,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=s.users_max_connections,
+            max_keepalive_connections=s.users_max_keepalive,
+            keepalive_expiry=s.users_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=s.users_connect_timeout,
+            read=s.users_read_timeout,
+            write=s.users_write_timeout,
+            pool=s.users_pool_timeout,
+        ),
+    )
+
+
+async def start_users_client() -> None:
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+
+async def close_users_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_users_client() -> httpx.AsyncClient:
+    """Devuelve el cliente compartido (lo crea si no se arrancó vía lifespan, p. ej. en scripts)."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+def pool_stats() -> dict[str, Any]:
+    """Estadísticas del pool de conexiones (para el endpoint de diagnóstico)."""
+    s = config.settings
+    stats: dict[str, Any] = {
+        "started": _client is not None,
+        "http2": _http2_active,
+        "max_connections": s.users_max_connections,
+        "max_keepalive": s.users_max_keepalive,
+        "keepalive_expiry": s.users_keepalive_expiry,
+    }
+    # httpx no expone el pool públicamente; leemos el de httpcore si está disponible
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    if pool is None:
+        return stats
+
+    connections = list(getattr(pool, "connections", []))
+    requests = list(getattr(pool, "_requests", []))
+    idle = sum(1 for c in connections if c.is_idle())
+    queued = sum(1 for r in requests if r.is_queued())
+    stats.update(
+        {
+            "connections": len(connections),
+            "active_connections": len(connections) - idle,
+            "idle_connections": idle,
+            "active_requests": len(requests) - queued,
+            "queued_requests": queued,
+        }
+    )
+    return stats
@@ -0,0 +1,125 @@
+# scripts/bench_album_listing.py
+# Benchmark del listado de álbumes (una página de AlbumOut): la carga anterior
+# (joinedload de géneros y de canciones completas + LIMIT) frente a
+# AlbumDAO.list_albums_page (selectinload, canciones solo por id, keyset).
+# Cuenta sentencias SQL y filas devueltas por la BD, además del tiempo,
+# sobre álbumes de 30+ canciones y 5 géneros.
+#
+#   DATABASE_URL=sqlite:///./bench_albums.db python -m scripts.bench_album_listing --seed
+#   DATABASE_URL=postgresql+psycopg://... python -m scripts.bench_album_listing -r 50
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_albums.db")
+
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, selectinload
+
+import app.models  # noqa: F401  (pobla Base.metadata)
+from app.api.responses import dump_json
+from app.dao.album_dao import AlbumDAO
+from app.db import Base, SessionLocal, engine
+from app.models.album import Album
+from app.models.genre import Genre
+from app.models.song import Cancion
+from app.schemas.album import AlbumOut
+from app.services.seed import ensure_seed_genres
+
+
+def seed(n_albums: int, songs_per_album: int, genres_per_album: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        ensure_seed_genres(db)
+        genres = db.query(Genre).order_by(Genre.id).all()[:genres_per_album]
+        for a in range(n_albums):
+            album = Album(titulo=f"Álbum {a}", precio=5)
+            album.genres = list(genres)
+            album.set_artistas_emails([f"artista{a % 50}@example.com"])
+            db.add(album)
+            db.flush()
+            for i in range(songs_per_album):
+                song = Cancion(
+                    nomCancion=f"Canción {a}-{i}",
+                    archivoMp3=f"uploads/audio/{a}-{i}.mp3",
+                    precio=1,
+                    idAlbum=album.id,
+                )
+                song.set_artistas_emails([f"artista{a % 50}@example.com"])
+                db.add(song)
+        db.commit()
+
+
+def legacy_page(db, limit: int):
+    # lo que hacía list_albums antes: el JOIN de dos colecciones multiplica
+    # las filas (géneros x canciones por álbum) y el LIMIT va en una subconsulta
+    return (
+        db.query(Album)
+        .options(
+            joinedload(Album.genres),
+            joinedload(Album.canciones),
+            selectinload(Album.artistas_refs),
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def new_page(db, limit: int):
+    return AlbumDAO(db).list_albums_page(limit=limit)[0]
+
+
+def measure(fn, limit: int, repeat: int):
+    """(sentencias, álbumes, bytes del JSON, mediana en ms de consulta + serialización)."""
+    captured: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        with SessionLocal() as db:
+            albums = fn(db, limit)
+            body = dump_json(list[AlbumOut], albums)
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    # filas que devuelve la BD (antes de que el ORM las deduplique)
+    with SessionLocal() as db:
+        conn = db.connection()
+        rows = sum(len(conn.exec_driver_sql(st, params).all()) for st, params in captured)
+
+    runs = []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            dump_json(list[AlbumOut], fn(db, limit))
+            runs.append((time.perf_counter() - t0) * 1000)
+    return len(captured), rows, len(albums), len(body), statistics.median(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true", help="crea tablas y datos de ejemplo")
+    parser.add_argument("--albums", type=int, default=400)
+    parser.add_argument("--songs", type=int, default=32, help="canciones por álbum")
+    parser.add_argument("--genres", type=int, default=5, help="géneros por álbum")
+    parser.add_argument("-l", "--limit", type=int, default=200, help="álbumes por página")
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.albums, args.songs, args.genres)
+
+    print(f"página de {args.limit} álbumes")
+    for label, fn in (("joinedload (antes)", legacy_page), ("list_albums_page", new_page)):
+        statements, rows, n_albums, size, ms = measure(fn, args.limit, args.repeat)
+        print(
+            f"{label:>20}: {ms:8.1f} ms  {statements} sentencias  {rows:7d} filas"
+            f"  ({n_albums} álbumes, {size} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# scripts/bench_async_reads.py
+# Throughput de los endpoints de lectura más usados (/canciones, /albumes):
+# DAO síncrono en `def` (threadpool) frente a DAO async en `async def`.
+#
+#   DATABASE_URL=sqlite:///./bench.db python -m scripts.bench_async_reads --seed
+#   DATABASE_URL=postgresql+psycopg://... python -m scripts.bench_async_reads -n 2000 -c 50
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+from fastapi import Depends, FastAPI
+
+import app.models  # noqa: F401  (pobla Base.metadata)
+from app.dao.album_dao import AlbumDAO, AsyncAlbumDAO
+from app.dao.song_dao import SongDAO, AsyncSongDAO
+from app.db import Base, SessionLocal, engine, async_engine
+from app.factories import get_album_dao, get_async_album_dao, get_async_song_dao, get_song_dao
+from app.models.album import Album
+from app.models.song import Cancion
+from app.schemas.album import AlbumOut
+from app.schemas.song import CancionOut
+from app.services.seed import ensure_seed_genres
+
+bench = FastAPI()
+
+
+@bench.get("/sync/canciones", response_model=list[CancionOut])
+def sync_canciones(song_dao: SongDAO = Depends(get_song_dao)):
+    return song_dao.list_songs()
+
+
+@bench.get("/async/canciones", response_model=list[CancionOut])
+async def async_canciones(song_dao: AsyncSongDAO = Depends(get_async_song_dao)):
+    return await song_dao.list_songs()
+
+
+@bench.get("/sync/albumes", response_model=list[AlbumOut])
+def sync_albumes(album_dao: AlbumDAO = Depends(get_album_dao)):
+    return album_dao.list_albums()
+
+
+@bench.get("/async/albumes", response_model=list[AlbumOut])
+async def async_albumes(album_dao: AsyncAlbumDAO = Depends(get_async_album_dao)):
+    return await album_dao.list_albums()
+
+
+def seed(n_albums: int = 20, songs_per_album: int = 10) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        ensure_seed_genres(db)
+        for a in range(n_albums):
+            album = Album(titulo=f"Álbum {a}", precio=5)
+            album.set_artistas_emails([f"artista{a}@example.com"])
+            db.add(album)
+            db.flush()
+            for i in range(songs_per_album):
+                song = Cancion(
+                    nomCancion=f"Canción {a}-{i}",
+                    archivoMp3=f"uploads/audio/{a}-{i}.mp3",
+                    precio=1,
+                    idAlbum=album.id,
+                )
+                song.set_artistas_emails([f"artista{a}@example.com"])
+                db.add(song)
+        db.commit()
+
+
+async def run(path: str, n: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # calentamiento
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with sem:
+                r = await client.get(path)
+                r.raise_for_status()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n)))
+        return n / (time.perf_counter() - t0)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=500, help="peticiones por endpoint")
+    parser.add_argument("-c", type=int, default=20, help="peticiones concurrentes")
+    parser.add_argument("--seed", action="store_true", help="crea tablas y datos de ejemplo")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed()
+
+    print(f"{args.n} peticiones, concurrencia {args.c}")
+    for endpoint in ("canciones", "albumes"):
+        sync_rps = await run(f"/sync/{endpoint}", args.n, args.c)
+        async_rps = await run(f"/async/{endpoint}", args.n, args.c)
+        print(f"/{endpoint:<10} sync: {sync_rps:8.1f} req/s   async: {async_rps:8.1f} req/s")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
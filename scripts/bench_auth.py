@@ -0,0 +1,91 @@
+# scripts/bench_auth.py
+# Compara la latencia de get_current_identity en modo "remote" (/auth/me contra
+# un servicio de usuarios local de pega) y en modo "local" (JWT verificado aquí).
+#
+#   python -m scripts.bench_auth [n_peticiones]
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import jwt
+import uvicorn
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import config
+from app.services import auth_proxy
+from app.services.identity_cache import identity_cache
+from app.services.users_client import close_users_client
+
+PORT = 8765
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+public_pem = private_key.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+)
+TOKEN = jwt.encode(
+    {"sub": "artista@example.com", "user_type": "artist", "exp": int(time.time()) + 3600},
+    private_key,
+    algorithm="RS256",
+)
+
+# --- servicio de usuarios de pega ---
+users = FastAPI()
+
+
+@users.get("/auth/me")
+async def me(authorization: str = Header(None)):
+    if authorization != f"Bearer {TOKEN}":
+        raise HTTPException(status_code=401)
+    return {"user_type": "artist", "user_data": {"email": "artista@example.com"}}
+
+
+def _start_users_service() -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(users, port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def _run(mode: str) -> float:
+    config.settings.auth_mode = mode
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=TOKEN)
+    await auth_proxy.get_current_identity(creds)  # calentamiento
+    t0 = time.perf_counter()
+    for _ in range(N):
+        await auth_proxy.get_current_identity(creds)
+    return (time.perf_counter() - t0) / N * 1e6
+
+
+async def main() -> None:
+    with tempfile.NamedTemporaryFile("wb", suffix=".pem", delete=False) as f:
+        f.write(public_pem)
+    config.settings.users_base_url = f"http://127.0.0.1:{PORT}"
+    config.settings.jwt_public_key_file = f.name
+    identity_cache.ttl = 0  # medimos el round trip real, sin caché
+
+    server = _start_users_service()
+    try:
+        remote = await _run("remote")
+        local = await _run("local")
+    finally:
+        await close_users_client()
+        server.should_exit = True
+        os.unlink(f.name)
+
+    print(f"{N} peticiones")
+    print(f"remote (/auth/me): {remote:8.1f} µs/petición")
+    print(f"local  (JWT):      {local:8.1f} µs/petición")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+# scripts/bench_serialization.py
+# Microbenchmark: tiempo de serializar una página de 200 CancionOut (y de
+# AlbumOut) con el camino por defecto de FastAPI (response_model +
+# jsonable_encoder + json.dumps) frente a app.api.responses (TypeAdapter
+# precompilado + dump_json de pydantic-core). No toca la base de datos: las
+# canciones se construyen en memoria con sus géneros y artistas.
+#
+#   python -m scripts.bench_serialization -n 200 -r 200
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import app.models  # noqa: F401  (configura los mappers)
+from app.api.responses import dump_json
+from app.models.album import Album
+from app.models.artist_links import AlbumArtistaLink, CancionArtistaLink
+from app.models.genre import Genre
+from app.models.song import Cancion
+from app.schemas.album import AlbumOut
+from app.schemas.song import CancionOut
+
+
+def build_songs(n: int) -> list[Cancion]:
+    genres = [Genre(id=i, name=name) for i, name in enumerate(["rock", "pop", "jazz"], 1)]
+    songs = []
+    for i in range(1, n + 1):
+        song = Cancion(
+            id=i,
+            nomCancion=f"Canción {i}",
+            archivoMp3=f"audio/{i}.mp3",
+            imgPortada=f"img/{i}.png",
+            date=date(2024, 1, 1 + i % 28),
+            precio=0.99,
+            numVisualizaciones=i * 10,
+            numIngresos=i * 0.5,
+            numLikes=i,
+            idAlbum=1 + i // 12,
+        )
+        song.genres = genres[: 1 + i % 3]
+        song.artistas_refs = [CancionArtistaLink(artista_email=f"artista{i % 7}@example.com")]
+        songs.append(song)
+    return songs
+
+
+def build_albums(n: int, songs: list[Cancion]) -> list[Album]:
+    albums = []
+    for i in range(1, n + 1):
+        album = Album(id=i, titulo=f"Álbum {i}", imgPortada=f"img/a{i}.png", precio=9.99)
+        album.canciones = songs[(i - 1) * 12 : i * 12]
+        album.artistas_refs = [AlbumArtistaLink(artista_email=f"artista{i % 7}@example.com")]
+        albums.append(album)
+    return albums
+
+
+def fastapi_default(tp, data) -> bytes:
+    # lo que hace FastAPI con response_model y la JSONResponse por defecto
+    field = create_model_field("response", tp, mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=data, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def timed(fn, repeat: int) -> tuple[float, float]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs), min(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=200, help="elementos por página")
+    parser.add_argument("-r", "--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    songs = build_songs(args.n)
+    albums = build_albums(max(1, args.n // 12), songs)
+    cases = [
+        (f"{args.n} x CancionOut", list[CancionOut], songs),
+        (f"{len(albums)} x AlbumOut", list[AlbumOut], albums),
+    ]
+    for label, tp, data in cases:
+        # mismo JSON por ambos caminos
+        assert json.loads(fastapi_default(tp, data)) == json.loads(dump_json(tp, data))
+        field = create_model_field("response", tp, mode="serialization")
+        loop = asyncio.new_event_loop()
+
+        def before():
+            content = loop.run_until_complete(
+                serialize_response(field=field, response_content=data, is_coroutine=True)
+            )
+            JSONResponse(content).body
+
+        def after():
+            dump_json(tp, data)
+
+        b_med, b_min = timed(before, args.repeat)
+        a_med, a_min = timed(after, args.repeat)
+        loop.close()
+        print(f"{label:>18}: FastAPI por defecto {b_med:7.2f} ms (min {b_min:.2f})"
+              f" | TypeAdapter+dump_json {a_med:7.2f} ms (min {a_min:.2f})"
+              f" | x{b_med / a_med:.1f}")
+
+
+if __name__ == "__main__":
+    main()
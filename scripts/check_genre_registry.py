@@ -0,0 +1,69 @@
+# scripts/check_genre_registry.py
+# Comprueba que el registro de géneros se mantiene en las escrituras: dos altas
+# seguidas de canciones con géneros (cada una en su transacción, como dos
+# requests) no pueden leer la tabla `genre`. Asociar un género a una canción
+# deja el Genre en session.dirty (colección inversa) y eso no debe invalidar
+# el registro. Sale con código 1 si alguna escritura vuelve a leer `genre`.
+#
+#   DATABASE_URL=sqlite:///./bench.db python -m scripts.check_genre_registry
+import os
+import re
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (pobla Base.metadata)
+from app.dao.song_dao import SongDAO
+from app.db import Base, SessionLocal, engine
+from app.models.song import Cancion
+from app.services.genre_registry import genre_registry
+from app.services.seed import DEFAULT_GENRES, ensure_seed_genres
+
+_GENRE_SELECT = re.compile(r"^\s*SELECT\b.*\bFROM\s+genre\b", re.IGNORECASE | re.DOTALL)
+
+
+def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        ensure_seed_genres(db)
+
+    selects: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if _GENRE_SELECT.match(statement):
+            selects.append(statement)
+
+    created: list[int] = []
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        for i, genres in enumerate((DEFAULT_GENRES[:2], DEFAULT_GENRES[1:3])):
+            with SessionLocal() as db:
+                song = SongDAO(db).create(
+                    nomCancion=f"genre-check {i}",
+                    archivoMp3="genre-check.mp3",
+                    imgPortada=None,
+                    genre_names=list(genres),
+                    precio=0,
+                )
+                db.commit()
+                created.append(song.id)
+            if genre_registry._by_name is None:
+                selects.append(f"(registro invalidado tras la escritura {i + 1})")
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+        with SessionLocal() as db:
+            db.query(Cancion).filter(Cancion.id.in_(created)).delete(synchronize_session=False)
+            db.commit()
+
+    if selects:
+        print("FALLO: las escrituras leen la tabla genre:")
+        for statement in selects:
+            print("   ", " ".join(statement.split())[:200])
+        sys.exit(1)
+    print(f"ok: {len(created)} altas con géneros sin leer la tabla genre")
+
+
+if __name__ == "__main__":
+    main()
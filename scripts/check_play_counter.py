@@ -0,0 +1,130 @@
+# scripts/check_play_counter.py
+# Prueba de concurrencia del contador de reproducciones (write-behind): varios
+# hilos registran reproducciones mientras dos "workers" (dos PlayCounter, como
+# dos procesos) vuelcan a la vez, y uno de cada N volcados falla a propósito
+# para comprobar que lo tomado se devuelve al contador. Al final se vacía todo
+# y numVisualizaciones tiene que coincidir exactamente con lo registrado.
+# Sale con código 1 si se ha perdido o duplicado alguna reproducción.
+#
+#   DATABASE_URL=sqlite:///./bench.db python -m scripts.check_play_counter
+#   DATABASE_URL=postgresql+psycopg://... python -m scripts.check_play_counter -t 32 -n 5000
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from itertools import count
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import app.models  # noqa: F401  (pobla Base.metadata)
+from app.db import Base, SessionLocal, engine
+from app.models.song import Cancion
+from app.services.play_counter import PlayCounter
+
+
+class FlakySessions:
+    """SessionLocal que hace fallar el commit de uno de cada `every` volcados."""
+
+    def __init__(self, every: int):
+        self.every = every
+        self._calls = count(1)
+        self.failures = 0
+
+    def __call__(self):
+        db = SessionLocal()
+        if self.every and next(self._calls) % self.every == 0:
+            self.failures += 1
+
+            def fail():
+                raise RuntimeError("fallo simulado al volcar")
+
+            db.commit = fail
+        return db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--songs", type=int, default=20)
+    parser.add_argument("-t", "--threads", type=int, default=16)
+    parser.add_argument("-n", "--plays", type=int, default=20000, help="reproducciones por hilo")
+    parser.add_argument("--fail-every", type=int, default=5, help="0 = sin fallos simulados")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        songs = [
+            Cancion(nomCancion=f"play-check {i}", archivoMp3="play-check.mp3", precio=0)
+            for i in range(args.songs)
+        ]
+        db.add_all(songs)
+        db.commit()
+        song_ids = [s.id for s in songs]
+
+    sessions = FlakySessions(args.fail_every)
+    workers = [PlayCounter(sessions), PlayCounter(sessions)]
+    expected: Counter[int] = Counter()
+    expected_lock = threading.Lock()
+    done = threading.Event()
+
+    def player(seed: int) -> None:
+        rnd = random.Random(seed)
+        local: Counter[int] = Counter()
+        worker = workers[seed % len(workers)]
+        for _ in range(args.plays):
+            # unas pocas canciones se llevan casi todas las reproducciones
+            song_id = song_ids[min(int(rnd.expovariate(0.5)), len(song_ids) - 1)]
+            worker.record(song_id)
+            local[song_id] += 1
+        with expected_lock:
+            expected.update(local)
+
+    def flusher(worker: PlayCounter) -> None:
+        while not done.is_set():
+            try:
+                worker.flush()
+            except RuntimeError:
+                pass
+            time.sleep(0.002)
+
+    flushers = [threading.Thread(target=flusher, args=(w,)) for w in workers]
+    players = [threading.Thread(target=player, args=(i,)) for i in range(args.threads)]
+    t0 = time.perf_counter()
+    for t in flushers + players:
+        t.start()
+    for t in players:
+        t.join()
+    done.set()
+    for t in flushers:
+        t.join()
+    # vaciado final (como en el apagado); sin fallos simulados
+    sessions.every = 0
+    for worker in workers:
+        worker.flush()
+    elapsed = time.perf_counter() - t0
+
+    with SessionLocal() as db:
+        rows = dict(
+            db.query(Cancion.id, Cancion.numVisualizaciones).filter(Cancion.id.in_(song_ids)).all()
+        )
+        db.query(Cancion).filter(Cancion.id.in_(song_ids)).delete(synchronize_session=False)
+        db.commit()
+
+    total = args.threads * args.plays
+    flushes = sum(w.flushes for w in workers)
+    print(
+        f"{total} reproducciones en {elapsed:.2f}s, {flushes} volcados"
+        f" ({sessions.failures} fallidos y reintentados)"
+    )
+    wrong = {i: (rows.get(i), expected[i]) for i in song_ids if rows.get(i) != expected[i]}
+    if wrong or sum(rows.values()) != total:
+        for song_id, (got, want) in sorted(wrong.items()):
+            print(f"FALLO  cancion {song_id}: numVisualizaciones={got}, esperado {want}")
+        sys.exit(1)
+    print("ok     no se ha perdido ni duplicado ninguna reproducción")
+
+
+if __name__ == "__main__":
+    main()
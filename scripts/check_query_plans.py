@@ -0,0 +1,140 @@
+# scripts/check_query_plans.py
+# Guarda de regresión de los planes de consulta de /canciones: ejecuta
+# SongDAO.list_songs_page, captura la consulta principal y comprueba con
+# EXPLAIN que usa los índices previstos (y que no vuelve el DISTINCT).
+# Sale con código 1 si algún plan no cumple, para poder usarlo en CI.
+#
+#   DATABASE_URL=sqlite:///./bench.db python -m scripts.check_query_plans
+#   DATABASE_URL=postgresql+psycopg://... python -m scripts.check_query_plans -v
+import argparse
+import os
+import sys
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (pobla Base.metadata)
+from app.dao.pagination import encode_cursor
+from app.dao.song_dao import SongDAO
+from app.db import Base, SessionLocal, engine
+from app.services.seed import ensure_seed_genres
+
+# Índices de cancion_genero válidos para el EXISTS: el planificador elige entre
+# entrar por genre_id (géneros poco frecuentes) o recorrer cancion en orden y
+# sondear la PK (cancion_id, genre_id); lo que no puede es leer la tabla entera.
+CANCION_GENERO_INDEXES = (
+    "ix_cancion_genero_genre_cancion",
+    "sqlite_autoindex_cancion_genero",
+    "cancion_genero_pkey",
+    "uq_cancion_genero",
+)
+NO_DISTINCT = ("DISTINCT", "Unique", "HashAggregate")
+NO_FULL_SCAN_CG = ("SCAN cancion_genero", "Seq Scan on cancion_genero")
+NO_SORT = ("TEMP B-TREE FOR ORDER BY", "Sort")
+NO_RAW_PLAYS = ("cancion_reproduccion_hora",)
+CANCION_RANKING_PK = ("sqlite_autoindex_cancion_ranking", "cancion_ranking_pkey")
+
+# (descripción, kwargs de list_songs_page, índices aceptables (alguno debe
+# aparecer), textos prohibidos)
+CHECKS = [
+    (
+        "genero (EXISTS sobre cancion_genero)",
+        {"genero": "rock"},
+        CANCION_GENERO_INDEXES,
+        NO_DISTINCT + NO_FULL_SCAN_CG,
+    ),
+    (
+        "varios géneros por prefijo + top (en vivo)",
+        {"genero": "r", "popularidad": "top"},
+        CANCION_GENERO_INDEXES,
+        NO_DISTINCT + NO_FULL_SCAN_CG,
+    ),
+    (
+        "top desde el ranking precalculado",
+        {"popularidad": "top", "cursor": encode_cursor("top@0", 20, 1000)},
+        CANCION_RANKING_PK,
+        NO_SORT,
+    ),
+    (
+        "top en vivo, página siguiente",
+        {"popularidad": "top", "cursor": encode_cursor("top", 3, 1000)},
+        ("ix_cancion_likes_id",),
+        NO_SORT,
+    ),
+    (
+        # la tendencia sale de las puntuaciones precalculadas, nunca de los eventos
+        "tendencia en vivo, página siguiente",
+        {"popularidad": "tendencia", "cursor": encode_cursor("tendencia", 3.5, 1000)},
+        ("cancion_tendencia",),
+        NO_RAW_PLAYS,
+    ),
+]
+
+
+@contextmanager
+def capture_statements():
+    captured: list[tuple[str, object]] = []
+
+    def _listener(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _listener)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _listener)
+
+
+def explain(db, statement: str, parameters) -> str:
+    conn = db.connection()
+    if engine.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        return "\n".join(row[-1] for row in rows)
+    if engine.dialect.name == "postgresql":
+        # con tablas pequeñas el planificador prefiere seq scan: lo desactivamos
+        # para comprobar que el índice *se puede* usar
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+        return "\n".join(row[0] for row in rows)
+    raise SystemExit(f"Dialecto no soportado: {engine.dialect.name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-v", "--verbose", action="store_true", help="imprime todos los planes")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    failures = 0
+    with SessionLocal() as db:
+        ensure_seed_genres(db)
+        for name, kwargs, required, forbidden in CHECKS:
+            with capture_statements() as captured:
+                SongDAO(db).list_songs_page(limit=20, **kwargs)
+            # la consulta principal es la única con LIMIT (la de géneros y los
+            # selectinload no lo llevan)
+            main_query = next(((s, p) for s, p in captured if "LIMIT" in s), None)
+            if main_query is None:
+                print(f"FALLO  {name}: no se ejecutó la consulta principal")
+                failures += 1
+                continue
+            plan = explain(db, *main_query)
+            uses_index = any(ix in plan for ix in required)
+            present = [text for text in forbidden if text in plan]
+            ok = uses_index and not present
+            failures += not ok
+            print(f"{'ok   ' if ok else 'FALLO'}  {name}")
+            if not uses_index:
+                print(f"       no usa ninguno de: {', '.join(required)}")
+            if present:
+                print(f"       aparece: {', '.join(present)}")
+            if args.verbose or not ok:
+                print("       " + plan.replace("\n", "\n       "))
+        db.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
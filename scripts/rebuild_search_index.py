@@ -0,0 +1,13 @@
+# scripts/rebuild_search_index.py
+# Rellena (o rehace) el índice de /api/buscar con todo el catálogo. Después,
+# la app lo mantiene sola en cada commit.
+#
+#   python -m scripts.rebuild_search_index
+from app.db import SessionLocal
+import app.models  # noqa
+from app.services.search_index import rebuild_all
+
+with SessionLocal() as db:
+    total = rebuild_all(db)
+    db.commit()
+print(f"Índice de búsqueda reconstruido: {total} filas ✅")